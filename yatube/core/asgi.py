@@ -0,0 +1,180 @@
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+
+from core.loaders import warm_up_templates
+
+
+class ASGIHandler:
+    """Приложение ASGI 3 поверх синхронного обработчика Django.
+
+    Django 2.2 не умеет асинхронные представления, поэтому запрос
+    целиком, вместе с обращениями к БД, выполняется в ограниченном
+    пуле потоков. Цикл событий тем временем держит медленных клиентов
+    и не занимает под них потоки.
+
+    Если клиент отключился, запрос без полного тела не выполняется,
+    ответ ушедшему клиенту не отправляется, а у потокового ответа
+    перестают читаться куски. Уже начатое представление доработает:
+    синхронный код в потоке прервать нельзя.
+    """
+
+    def __init__(self, wsgi_application=None, threads=None):
+        self.wsgi_application = wsgi_application or WSGIHandler()
+        self.executor = ThreadPoolExecutor(
+            threads or settings.ASGI_THREADS, thread_name_prefix='asgi'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(f'Неподдерживаемый тип соединения: '
+                             f'{scope["type"]}')
+        body = await read_body(receive)
+        if body is None:
+            # Клиент ушёл, не дослав тело: обрезанный запрос не выполняем.
+            return
+        # Пока выполняется представление, слушаем отключение клиента.
+        disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+        try:
+            await self.respond(scope, body, send, disconnected)
+        finally:
+            disconnected.cancel()
+
+    async def respond(self, scope, body, send, disconnected):
+        loop = asyncio.get_running_loop()
+        # Поток с начатым представлением не прервать: ответ дожидаемся,
+        # но клиенту, который ушёл, не отправляем.
+        status, headers, response = await loop.run_in_executor(
+            self.executor, self.call_wsgi, wsgi_environ(scope, body)
+        )
+        streaming = not isinstance(response, bytes)
+        if disconnected.done():
+            if streaming:
+                await loop.run_in_executor(self.executor, close, response)
+            return
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers,
+        })
+        if not streaming:
+            await send({'type': 'http.response.body', 'body': response})
+            return
+        # Потоковый ответ: каждый кусок читается в пуле, там же идёт БД.
+        # После отключения клиента следующие куски не читаются.
+        chunks = iter(response)
+        try:
+            while True:
+                chunk = await loop.run_in_executor(
+                    self.executor, next, chunks, None
+                )
+                if chunk is None or disconnected.done():
+                    break
+                await send({'type': 'http.response.body', 'body': chunk,
+                            'more_body': True})
+        finally:
+            await loop.run_in_executor(self.executor, close, response)
+        if not disconnected.done():
+            await send({'type': 'http.response.body', 'body': b''})
+
+    def call_wsgi(self, environ):
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in headers
+            ]
+
+        response = self.wsgi_application(environ, start_response)
+        if getattr(response, 'streaming', False):
+            return started['status'], started['headers'], response
+        try:
+            body = b''.join(response)
+        finally:
+            close(response)
+        return started['status'], started['headers'], body
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+async def read_body(receive):
+    """Тело запроса целиком, None — если клиент отключился раньше."""
+    body = io.BytesIO()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        body.write(message.get('body', b''))
+        if not message.get('more_body', False):
+            break
+    body.seek(0)
+    return body
+
+
+async def wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return
+
+
+def wsgi_environ(scope, body):
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            name = f'HTTP_{name}'
+        if name in environ:
+            # Куки разделяются точкой с запятой, остальные заголовки — запятой.
+            separator = '; ' if name == 'HTTP_COOKIE' else ','
+            value = f'{environ[name]}{separator}{value}'
+        environ[name] = value
+    return environ
+
+
+def close(response):
+    if hasattr(response, 'close'):
+        response.close()
+
+
+def get_asgi_application():
+    django.setup(set_prefix=False)
+    warm_up_templates()
+    return ASGIHandler()
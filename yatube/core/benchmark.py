@@ -0,0 +1,408 @@
+import asyncio
+import contextlib
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import unquote
+
+from django.core.servers.basehttp import (ThreadedWSGIServer,
+                                          WSGIRequestHandler)
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    if not values:
+        return None
+    rank = max(math.ceil(percent / 100 * len(values)) - 1, 0)
+    return values[rank]
+
+
+def summarize(samples, elapsed):
+    """Сводка по замерам: список (секунды, число SQL-запросов или None).
+
+    Неудачные запросы передаются как (None, None) и идут в errors.
+    """
+    timings = [seconds for seconds, _ in samples if seconds is not None]
+    queries = [count for _, count in samples if count is not None]
+    summary = {
+        'requests': len(samples),
+        'errors': len(samples) - len(timings),
+        'rps': round(len(samples) / elapsed, 1) if elapsed else None,
+        'queries': round(sum(queries) / len(queries), 1) if queries else None,
+    }
+    for percent in PERCENTILES:
+        value = percentile(timings, percent)
+        summary[f'p{percent}'] = (
+            round(value * 1000, 2) if value is not None else None
+        )
+    return summary
+
+
+def timed(func, count_queries=True):
+    """Вызывает func и возвращает (секунды, SQL-запросы, результат)."""
+    if not count_queries:
+        started = time.perf_counter()
+        result = func()
+        return time.perf_counter() - started, None, result
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+    return elapsed, len(queries), result
+
+
+def sample(func, count_queries=True):
+    try:
+        seconds, queries, _ = timed(func, count_queries)
+    except Exception:
+        return None, None
+    return seconds, queries
+
+
+def run(func, repeat, count_queries=True):
+    started = time.perf_counter()
+    samples = [sample(func, count_queries) for _ in range(repeat)]
+    return summarize(samples, time.perf_counter() - started)
+
+
+def run_concurrent(func, repeat, concurrency):
+    def concurrent_sample(_):
+        return sample(func, count_queries=False)
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        started = time.perf_counter()
+        samples = list(pool.map(concurrent_sample, range(repeat)))
+        elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed)
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baseline(path, results):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2,
+                  sort_keys=True)
+
+
+def compare(results, baseline, metric='p95'):
+    """Изменение метрики в процентах относительно базового прогона."""
+    changes = {}
+    for name, summary in results.items():
+        before = baseline.get(name, {}).get(metric)
+        after = summary.get(metric)
+        if before and after is not None:
+            changes[name] = round((after - before) / before * 100, 1)
+    return changes
+
+
+def format_table(results, changes=None):
+    columns = ('requests', 'errors', 'rps', 'queries') + tuple(
+        f'p{percent}' for percent in PERCENTILES
+    )
+    width = max([len(name) for name in results] + [8])
+    header = [f'{"":{width}}'] + [f'{column:>9}' for column in columns]
+    lines = [' '.join(header)]
+    for name, summary in results.items():
+        cells = [f'{name:{width}}']
+        for column in columns:
+            value = summary.get(column)
+            cells.append(f'{"-" if value is None else value:>9}')
+        if changes and name in changes:
+            cells.append(f'{changes[name]:+.1f}%')
+        lines.append(' '.join(cells))
+    return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def throwaway_database():
+    """Временная файловая копия схемы БД: её видят и потоки WSGI-сервера."""
+    directory = tempfile.mkdtemp()
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    saved_name = test_settings.get('NAME')
+    if connection.vendor == 'sqlite':
+        test_settings['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, keepdb=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = saved_name
+        with contextlib.suppress(OSError):
+            os.rmdir(directory)
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def wsgi_server(application=None):
+    """Поднимает многопоточный WSGI-сервер на localhost и отдаёт его URL."""
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler,
+                                allow_reuse_address=False)
+    server.set_app(application or get_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextlib.contextmanager
+def stress_database(path, options, conn_max_age=0):
+    """Временный псевдоним БД с файлом SQLite для нагрузки потоками."""
+    alias = 'sqlite_stress'
+    connections.databases[alias] = {
+        'ENGINE': 'core.db.backends.sqlite3',
+        'NAME': path,
+        'CONN_MAX_AGE': conn_max_age,
+        'OPTIONS': options,
+    }
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('CREATE TABLE IF NOT EXISTS stress '
+                           '(id INTEGER PRIMARY KEY, value TEXT)')
+        yield alias
+    finally:
+        connections[alias].close()
+        del connections[alias]
+        del connections.databases[alias]
+
+
+def sqlite_stress(path, options, writers=4, readers=4, operations=100):
+    """Параллельные читатели и писатели на одном файле SQLite.
+
+    Писатель в транзакции сначала читает, потом пишет — на этом
+    стандартный BEGIN падает с database is locked при повышении
+    блокировки.
+    """
+    def work(write):
+        done = errors = 0
+        try:
+            for number in range(operations):
+                try:
+                    with transaction.atomic(using=alias), \
+                            connections[alias].cursor() as cursor:
+                        cursor.execute('SELECT COUNT(*) FROM stress')
+                        if write:
+                            cursor.execute(
+                                'INSERT INTO stress (value) VALUES (%s)',
+                                [f'value {number}'],
+                            )
+                    done += 1
+                except Exception:
+                    errors += 1
+        finally:
+            connections[alias].close()
+        return write, done, errors
+
+    with stress_database(path, options) as alias:
+        with ThreadPoolExecutor(writers + readers) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(
+                work, [True] * writers + [False] * readers
+            ))
+            elapsed = time.perf_counter() - started
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM stress')
+            rows = cursor.fetchone()[0]
+    return {
+        'writes': sum(done for write, done, _ in results if write),
+        'reads': sum(done for write, done, _ in results if not write),
+        'errors': sum(errors for _, _, errors in results),
+        'rows': rows,
+        'ops': round(sum(done for _, done, _ in results) / elapsed, 1),
+    }
+
+
+TEMPLATE_REFERENCE = re.compile(r"""{%\s*(?:extends|include)\s+["']([^"']+)""")
+
+
+def template_source(name, engine):
+    """Исходник шаблона вместе с родительскими и включёнными."""
+    source = engine.get_template(name).template.source
+    return source + ''.join(
+        template_source(reference, engine)
+        for reference in TEMPLATE_REFERENCE.findall(source)
+    )
+
+
+def template_chain(name, engine):
+    """Шаблон и все, что он расширяет и включает, без повторов.
+
+    engine — django.template.Engine, а не бэкенд из engines.
+    """
+    source = engine.get_template(name).source
+    names = [name]
+    for reference in TEMPLATE_REFERENCE.findall(source):
+        names += template_chain(reference, engine)
+    return list(dict.fromkeys(names))
+
+
+def used_names(source, names):
+    return [name for name in names
+            if re.search(rf'\b{re.escape(name)}\b', source)]
+
+
+def run_context_processors(processors, request, names):
+    """Вызов процессоров и обращение к переменным, как при отрисовке."""
+    context = {}
+    for processor in processors:
+        context.update(processor(request))
+    for name in names:
+        if name in context:
+            # bool вычисляет ленивые значения и почти ничего не стоит.
+            bool(context[name])
+    return context
+
+
+def best_time(func, repeat, rounds=5):
+    """Время одного вызова func в микросекундах, лучшее из rounds."""
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / repeat * 1e6
+
+
+def time_context_processors(processors, request, names, repeat, rounds=5):
+    """Время на одну отрисовку в микросекундах, лучшее из rounds."""
+    return best_time(
+        lambda: run_context_processors(processors, request, names),
+        repeat, rounds,
+    )
+
+
+def with_query_delay(application, delay):
+    """WSGI-приложение, где каждый SQL-запрос дольше на delay секунд."""
+    def slow_execute(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    def delayed_application(environ, start_response):
+        with connection.execute_wrapper(slow_execute):
+            return application(environ, start_response)
+
+    return delayed_application
+
+
+class ASGIConnection:
+    """Минимальный HTTP/1.1 с keep-alive для прогона ASGI-приложения."""
+
+    def __init__(self, application, reader, writer):
+        self.application = application
+        self.reader = reader
+        self.writer = writer
+
+    async def serve(self):
+        try:
+            while await self.handle_request():
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writer.close()
+
+    async def handle_request(self):
+        request_line = await self.reader.readline()
+        if not request_line.strip():
+            return False
+        method, target, version = request_line.decode('latin-1').split()
+        headers = []
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers.append((name.strip().lower().encode('latin-1'),
+                            value.strip().encode('latin-1')))
+        fields = dict(headers)
+        length = int(fields.get(b'content-length', 0))
+        body = await self.reader.readexactly(length) if length else b''
+        path, _, query = target.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': version.split('/')[1],
+            'method': method,
+            'scheme': 'http',
+            'path': unquote(path),
+            'raw_path': path.encode('latin-1'),
+            'query_string': query.encode('latin-1'),
+            'root_path': '',
+            'headers': headers,
+            'client': self.writer.get_extra_info('peername')[:2],
+            'server': self.writer.get_extra_info('sockname')[:2],
+        }
+        messages = [{'type': 'http.request', 'body': body}]
+        started = {}
+        chunks = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Клиент на связи, пока ответ не отправлен.
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                started.update(message)
+            else:
+                chunks.append(message.get('body', b''))
+
+        await self.application(scope, receive, send)
+        content = b''.join(chunks)
+        status = HTTPStatus(started['status'])
+        lines = [f'HTTP/1.1 {status.value} {status.phrase}'.encode()]
+        lines += [name + b': ' + value for name, value in started['headers']
+                  if name not in (b'content-length', b'transfer-encoding')]
+        lines.append(b'Content-Length: ' + str(len(content)).encode())
+        self.writer.write(b'\r\n'.join(lines) + b'\r\n\r\n' + content)
+        await self.writer.drain()
+        return fields.get(b'connection', b'').lower() != b'close'
+
+
+@contextlib.contextmanager
+def asgi_server(application):
+    """Поднимает ASGI-приложение на localhost в своём цикле событий."""
+    loop = asyncio.new_event_loop()
+
+    async def handle(reader, writer):
+        await ASGIConnection(application, reader, writer).serve()
+
+    server = loop.run_until_complete(
+        asyncio.start_server(handle, '127.0.0.1', 0)
+    )
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Tags, Warning, register
+from django.utils.module_loading import import_string
+
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def cache_is_shared(alias='default'):
+    # По классу, без подключения к серверу кэша.
+    backend = import_string(settings.CACHES[alias]['BACKEND'])
+    return not issubclass(backend, PROCESS_LOCAL_CACHES)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if cache_is_shared():
+        return []
+    return [Warning(
+        'Кэш по умолчанию свой у каждого процесса.',
+        hint='Версии лент, ленты и кэш объектов сбрасываются только '
+             'в процессе, который изменил данные, остальные отдают '
+             'устаревшие страницы. Запускайте один процесс или задайте '
+             'CACHE_LOCATION.',
+        id='core.W001',
+    )]
@@ -0,0 +1,22 @@
+import time
+from functools import wraps
+
+
+def time_bucketed(seconds):
+    """Кэширует результат функции без аргументов на seconds секунд.
+
+    Интервалы отсчитываются от эпохи: значение обновляется на границе
+    интервала одновременно во всех процессах.
+    """
+    def decorator(func):
+        cached = {}
+
+        @wraps(func)
+        def wrapper():
+            bucket = int(time.time() // seconds)
+            entry = cached.get('entry')
+            if entry is None or entry[0] != bucket:
+                entry = cached['entry'] = (bucket, func())
+            return entry[1]
+        return wrapper
+    return decorator
@@ -1,8 +1,14 @@
 import datetime
 
+from .cached import time_bucketed
+
+
+@time_bucketed(60)
+def current_year():
+    return datetime.datetime.now().year
+
 
 def year(request):
-    now = datetime.datetime.now()
     return {
-        'year': now.year
+        'year': current_year()
     }
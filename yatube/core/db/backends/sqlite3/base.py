@@ -0,0 +1,84 @@
+import random
+import time
+
+from django.db.backends.sqlite3 import base
+from django.db.backends.sqlite3.base import Database
+
+
+def is_busy(error):
+    message = str(error)
+    return 'locked' in message or 'busy' in message
+
+
+def retry_busy(func, retries, backoff):
+    """Повторяет func, пока БД занята, с экспоненциальной паузой."""
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Database.OperationalError as error:
+            if attempt == retries or not is_busy(error):
+                raise
+            time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+
+class SQLiteCursorWrapper(base.SQLiteCursorWrapper):
+    busy_retries = 0
+    busy_backoff = 0
+
+    def execute(self, query, params=None):
+        # Внутри транзакции повтор отдельного запроса небезопасен,
+        # её целиком защищает BEGIN IMMEDIATE.
+        if self.connection.in_transaction or not self.busy_retries:
+            return super().execute(query, params)
+        return retry_busy(lambda: super(SQLiteCursorWrapper, self).execute(
+            query, params
+        ), self.busy_retries, self.busy_backoff)
+
+    def executemany(self, query, param_list):
+        if self.connection.in_transaction or not self.busy_retries:
+            return super().executemany(query, param_list)
+        param_list = list(param_list)
+        return retry_busy(
+            lambda: super(SQLiteCursorWrapper, self).executemany(
+                query, param_list
+            ), self.busy_retries, self.busy_backoff,
+        )
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с PRAGMA при подключении и повтором при занятой БД.
+
+    Дополнительные OPTIONS:
+    pragmas — словарь PRAGMA для каждого нового соединения;
+    transaction_mode — режим BEGIN для transaction.atomic, IMMEDIATE
+    сразу берёт блокировку записи и не падает на её повышении;
+    busy_retries и busy_backoff — число повторов и начальная пауза
+    в секундах, когда БД занята.
+    """
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        self.pragmas = kwargs.pop('pragmas', {})
+        self.transaction_mode = kwargs.pop('transaction_mode', None)
+        self.busy_retries = kwargs.pop('busy_retries', 0)
+        self.busy_backoff = kwargs.pop('busy_backoff', 0.01)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=SQLiteCursorWrapper)
+        cursor.busy_retries = self.busy_retries
+        cursor.busy_backoff = self.busy_backoff
+        return cursor
+
+    def _start_transaction_under_autocommit(self):
+        # До BEGIN соединение вне транзакции: курсор сам повторит запрос.
+        self.cursor().execute(
+            f'BEGIN {self.transaction_mode}' if self.transaction_mode
+            else 'BEGIN'
+        )
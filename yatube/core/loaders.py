@@ -0,0 +1,157 @@
+import copyreg
+import logging
+import os
+import pickle
+
+import django
+from django.conf import settings
+from django.template import Engine, TemplateDoesNotExist, engines, smartif
+from django.template.loaders import cached
+from django.template.loaders.base import Loader as BaseLoader
+
+logger = logging.getLogger('yatube.templates')
+
+BUNDLE_FORMAT = 1
+
+
+def make_operator(operator_id, state):
+    operator = smartif.OPERATORS[operator_id]()
+    operator.__dict__.update(state)
+    return operator
+
+
+def reduce_operator(operator):
+    # Классы операторов {% if %} локальные, pickle их по имени не найдёт.
+    return make_operator, (operator.id, operator.__dict__)
+
+
+class BundlePickler(pickle.Pickler):
+    """Pickle шаблонов без движка и загрузчиков: их подставит загрузка."""
+
+    dispatch_table = copyreg.dispatch_table.copy()
+    for operator_class in smartif.OPERATORS.values():
+        dispatch_table[operator_class] = reduce_operator
+
+    def __init__(self, file, engine, loaders):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.engine = engine
+        self.loaders = loaders
+
+    def persistent_id(self, obj):
+        if obj is self.engine:
+            return 'engine'
+        if isinstance(obj, BaseLoader):
+            return ('loader', self.loaders.index(obj))
+        if isinstance(obj, Engine):
+            raise pickle.PicklingError('Шаблон чужого движка')
+        return None
+
+
+class BundleUnpickler(pickle.Unpickler):
+    def __init__(self, file, engine, loaders):
+        super().__init__(file)
+        self.engine = engine
+        self.loaders = loaders
+
+    def persistent_load(self, pid):
+        if pid == 'engine':
+            return self.engine
+        return self.loaders[pid[1]]
+
+
+class Loader(cached.Loader):
+    """Кэширующий загрузчик, который берёт шаблоны из готового набора.
+
+    Набор — скомпилированные шаблоны в pickle, его пишет команда
+    warm_templates --bundle. Шаблон из набора используется, только
+    если его исходник не менялся; остальные компилируются при первом
+    обращении, как в cached.Loader.
+    """
+
+    def __init__(self, engine, loaders):
+        super().__init__(engine, loaders)
+        path = settings.TEMPLATES_BUNDLE
+        if path and os.path.exists(path):
+            self.load_bundle(path)
+
+    def all_loaders(self):
+        return [self, *self.loaders]
+
+    def load_bundle(self, path):
+        with open(path, 'rb') as file:
+            header = pickle.load(file)
+            if header != (BUNDLE_FORMAT, django.get_version()):
+                logger.warning('Набор шаблонов %s собран другой версией',
+                               path)
+                return 0
+            bundle = BundleUnpickler(file, self.engine,
+                                     self.all_loaders()).load()
+        for name, template in bundle.items():
+            if template.source == self.current_source(name):
+                self.get_template_cache[name] = template
+        return len(self.get_template_cache)
+
+    def current_source(self, name):
+        for origin in self.get_template_sources(name):
+            try:
+                return origin.loader.get_contents(origin)
+            except TemplateDoesNotExist:
+                continue
+        return None
+
+    def write_bundle(self, path, names):
+        bundle = {name: self.get_template(name) for name in names}
+        with open(path, 'wb') as file:
+            pickle.dump((BUNDLE_FORMAT, django.get_version()), file)
+            BundlePickler(file, self.engine, self.all_loaders()).dump(bundle)
+
+
+def engine_copy(engine, loaders):
+    """Движок с настройками engine и другими загрузчиками."""
+    return Engine(
+        dirs=engine.dirs,
+        context_processors=engine.context_processors,
+        debug=engine.debug,
+        loaders=loaders,
+        string_if_invalid=engine.string_if_invalid,
+        file_charset=engine.file_charset,
+        libraries=engine.libraries,
+        builtins=[name for name in engine.builtins
+                  if name not in Engine.default_builtins],
+        autoescape=engine.autoescape,
+    )
+
+
+def cached_engine(engine):
+    """Движок с кэшем шаблонов: configured, если кэш уже включён."""
+    if isinstance(engine.template_loaders[0], Loader):
+        return engine
+    return engine_copy(engine, [('core.loaders.Loader',
+                                 settings.TEMPLATE_LOADERS)])
+
+
+def template_names(engine):
+    """Имена всех шаблонов в каталогах DIRS."""
+    names = []
+    for directory in engine.dirs:
+        for root, _, files in os.walk(directory):
+            names += sorted(
+                os.path.relpath(os.path.join(root, file), directory)
+                .replace(os.sep, '/')
+                for file in files if file.endswith(('.html', '.txt'))
+            )
+    return names
+
+
+def warm_up(engine):
+    """Компилирует все шаблоны DIRS, чтобы запросы их не разбирали."""
+    names = template_names(engine)
+    for name in names:
+        engine.get_template(name)
+    return names
+
+
+def warm_up_templates():
+    """Прогрев при запуске сервера, если шаблоны кэшируются."""
+    if settings.TEMPLATES_CACHED:
+        warm_up(engines['django'].engine)
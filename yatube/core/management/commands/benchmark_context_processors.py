@@ -0,0 +1,66 @@
+import datetime
+import glob
+import os
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.test import RequestFactory
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+
+from core.benchmark import (run_context_processors, template_source,
+                            time_context_processors, used_names)
+
+# csrf Django подключает всегда, до процессоров из настроек.
+STOCK_PROCESSORS = (
+    'django.template.context_processors.csrf',
+    'django.template.context_processors.debug',
+    'django.template.context_processors.request',
+    'django.contrib.auth.context_processors.auth',
+    'django.contrib.messages.context_processors.messages',
+)
+
+
+def eager_year(request):
+    return {'year': datetime.datetime.now().year}
+
+
+class Command(BaseCommand):
+    help = ('Время контекстных процессоров на одну отрисовку шаблонов '
+            'posts и about: стандартные процессоры против настроенных')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        engine = engines['django']
+        stock = [import_string(path) for path in STOCK_PROCESSORS]
+        stock.append(eager_year)
+        configured = list(engine.engine.template_context_processors)
+        request = RequestFactory().get('/')
+        request.user = SimpleLazyObject(AnonymousUser)
+        names = set()
+        for processor in stock + configured:
+            names.update(run_context_processors([processor], request, ()))
+        templates = sorted(
+            os.path.relpath(path, settings.TEMPLATES_DIR)
+            for app in ('posts', 'about')
+            for path in glob.glob(
+                os.path.join(settings.TEMPLATES_DIR, app, '*.html')
+            )
+        )
+        width = max(len(name) for name in templates)
+        self.stdout.write(f'{"мкс на отрисовку":{width}} '
+                          f'{"stock":>8} {"current":>8} {"изм.":>8}')
+        for name in templates:
+            used = used_names(template_source(name, engine), sorted(names))
+            before, after = (
+                time_context_processors(processors, request, used,
+                                        options['repeat'])
+                for processors in (stock, configured)
+            )
+            change = (after - before) / before * 100
+            self.stdout.write(f'{name:{width}} {before:8.2f} {after:8.2f} '
+                              f'{change:+7.1f}%')
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.test import override_settings
+
+from core.benchmark import best_time, template_chain
+from core.loaders import Loader, engine_copy, warm_up
+
+
+def load_chain(engine, names):
+    for name in names:
+        engine.get_template(name)
+
+
+class Command(BaseCommand):
+    help = ('Загрузка и разбор шаблонов posts и about на одну отрисовку '
+            'без кэша и с кэшем, время старта с набором и без')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        configured = engines['django'].engine
+        cached_loaders = [('core.loaders.Loader', settings.TEMPLATE_LOADERS)]
+        uncached = engine_copy(configured, settings.TEMPLATE_LOADERS)
+        with override_settings(TEMPLATES_BUNDLE=''):
+            cached = engine_copy(configured, cached_loaders)
+        names = warm_up(cached)
+        pages = [name for name in names
+                 if name.split('/')[0] in ('posts', 'about')
+                 and '/includes/' not in name]
+        width = max(len(name) for name in pages)
+        self.stdout.write(f'{"мкс на отрисовку":{width}} {"шаблонов":>8} '
+                          f'{"без кэша":>9} {"с кэшем":>9}')
+        for name in pages:
+            chain = template_chain(name, cached)
+            before, after = (
+                best_time(lambda: load_chain(engine, chain),
+                          options['repeat'])
+                for engine in (uncached, cached)
+            )
+            self.stdout.write(f'{name:{width}} {len(chain):8} '
+                              f'{before:9.1f} {after:9.1f}')
+        self.report_startup(configured, cached_loaders, names)
+
+    def report_startup(self, configured, cached_loaders, names):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'templates.bundle')
+            with override_settings(TEMPLATES_BUNDLE=path):
+                compiled = engine_copy(configured, cached_loaders)
+                started = time.perf_counter()
+                warm_up(compiled)
+                compile_time = time.perf_counter() - started
+                compiled.template_loaders[0].write_bundle(path, names)
+                started = time.perf_counter()
+                bundled = engine_copy(configured, cached_loaders)
+                loader = bundled.template_loaders[0]
+                warm_up(bundled)
+                bundle_time = time.perf_counter() - started
+        assert isinstance(loader, Loader)
+        self.stdout.write(
+            f'\nСтарт, {len(names)} шаблонов: компиляция '
+            f'{compile_time * 1000:.1f} мс, из набора '
+            f'{bundle_time * 1000:.1f} мс '
+            f'({len(loader.get_template_cache)} из набора)'
+        )
@@ -0,0 +1,75 @@
+import glob
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+def read_records(path):
+    # Ротированные файлы queries.log.1 ... идут вместе с текущим.
+    for name in sorted(glob.glob(f'{path}*')):
+        with open(name, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class Command(BaseCommand):
+    help = 'Сводка по журналу медленных и повторяющихся запросов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=settings.QUERY_LOG_FILE)
+        parser.add_argument('--top', type=int, default=10)
+
+    def handle(self, *args, **options):
+        slow = defaultdict(lambda: {'count': 0, 'total_ms': 0.0,
+                                    'max_ms': 0.0, 'locations': set()})
+        duplicates = defaultdict(lambda: {'requests': 0, 'max_count': 0,
+                                          'locations': set()})
+        for record in read_records(options['path']):
+            location = ' '.join(filter(None, (
+                record.get('view'), record.get('code'),
+                record.get('template'),
+            )))
+            if record.get('event') == 'slow_query':
+                entry = slow[record['sql']]
+                entry['count'] += 1
+                entry['total_ms'] += record['duration_ms']
+                entry['max_ms'] = max(entry['max_ms'],
+                                      record['duration_ms'])
+            elif record.get('event') == 'duplicate_query':
+                entry = duplicates[record['sql']]
+                entry['requests'] += 1
+                entry['max_count'] = max(entry['max_count'],
+                                         record['count'])
+            else:
+                continue
+            if location:
+                entry['locations'].add(location)
+
+        top = options['top']
+        self.stdout.write(self.style.MIGRATE_HEADING('Медленные запросы'))
+        for sql, entry in sorted(slow.items(),
+                                 key=lambda item: -item[1]['total_ms'])[:top]:
+            self.stdout.write(
+                f"{entry['total_ms']:.1f} мс всего, {entry['count']} раз, "
+                f"максимум {entry['max_ms']:.1f} мс\n  {sql}"
+            )
+            self.write_locations(entry['locations'])
+        self.stdout.write(self.style.MIGRATE_HEADING('Повторяющиеся запросы'))
+        for sql, entry in sorted(
+            duplicates.items(),
+            key=lambda item: -item[1]['requests'] * item[1]['max_count'],
+        )[:top]:
+            self.stdout.write(
+                f"в {entry['requests']} запросах, до {entry['max_count']} "
+                f"повторов\n  {sql}"
+            )
+            self.write_locations(entry['locations'])
+
+    def write_locations(self, locations):
+        for location in sorted(locations):
+            self.stdout.write(f'    {location}')
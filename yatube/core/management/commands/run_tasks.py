@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.tasks import DatabaseBackend, get_backend
+
+
+class Command(BaseCommand):
+    help = 'Обработчик очереди фоновых задач в БД (TASKS_BACKEND)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Выполнить готовые задачи и выйти')
+        parser.add_argument('--sleep', type=float, default=1,
+                            help='Пауза при пустой очереди, секунд')
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        if not isinstance(backend, DatabaseBackend):
+            raise CommandError('Очередь в БД выключена: TASKS_BACKEND '
+                               'не core.tasks.DatabaseBackend')
+        done = 0
+        while True:
+            if backend.run_next():
+                done += 1
+            elif options['once']:
+                break
+            else:
+                time.sleep(options['sleep'])
+        self.stdout.write(f'Выполнено задач: {done}')
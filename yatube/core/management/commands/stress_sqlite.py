@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.benchmark import sqlite_stress
+
+COLUMNS = ('writes', 'reads', 'errors', 'rows', 'ops')
+
+
+class Command(BaseCommand):
+    help = ('Параллельные читатели и писатели на временном файле SQLite: '
+            'стандартные настройки против SQLITE_TUNED_OPTIONS')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--operations', type=int, default=200,
+                            help='Транзакций на каждый поток')
+
+    def handle(self, *args, **options):
+        modes = {'stock': {}, 'tuned': settings.SQLITE_TUNED_OPTIONS}
+        self.stdout.write(f'{"":8}' + ''.join(f'{c:>9}' for c in COLUMNS))
+        for name, sqlite_options in modes.items():
+            with tempfile.TemporaryDirectory() as directory:
+                result = sqlite_stress(
+                    os.path.join(directory, 'stress.sqlite3'),
+                    sqlite_options, options['writers'], options['readers'],
+                    options['operations'],
+                )
+            self.stdout.write(f'{name:8}' + ''.join(
+                f'{result[column]:>9}' for column in COLUMNS
+            ))
@@ -0,0 +1,31 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import engines
+
+from core.loaders import cached_engine, warm_up
+
+
+class Command(BaseCommand):
+    help = ('Компилирует все шаблоны из templates/; с --bundle '
+            'записывает их набор, который загрузчик прочитает при старте')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--bundle', nargs='?', const='', default=None,
+            help='Куда записать набор, по умолчанию TEMPLATES_BUNDLE',
+        )
+
+    def handle(self, *args, **options):
+        engine = cached_engine(engines['django'].engine)
+        started = time.perf_counter()
+        names = warm_up(engine)
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(f'Шаблонов: {len(names)}, {elapsed:.1f} мс')
+        if options['bundle'] is not None:
+            path = options['bundle'] or settings.TEMPLATES_BUNDLE
+            engine.template_loaders[0].write_bundle(path, names)
+            self.stdout.write(f'Набор: {path}, '
+                              f'{os.path.getsize(path) / 1024:.0f} КБ')
@@ -0,0 +1,42 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core.profiling import start_profile, stats, stop_profile
+
+
+class ProfilingMiddleware:
+    """Профилирует долю запросов PROFILING_SAMPLE_RATE.
+
+    Время представления, SQL, шаблонов и обращения к кэшу уходят
+    в агрегаты по имени URL, а персоналу — и в заголовок Server-Timing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+        profile = start_profile()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(profile.sql_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            stop_profile()
+        profile.total_time = time.perf_counter() - started
+        match = request.resolver_match
+        if match is not None:
+            stats.record(match.view_name, profile)
+        user = getattr(request, 'user', None)
+        if settings.PROFILING_SERVER_TIMING and user and user.is_staff:
+            response['Server-Timing'] = profile.server_timing()
+        return response
@@ -0,0 +1,29 @@
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core.query_log import QueryCollector
+
+
+class QueryLogMiddleware:
+    """Пишет медленные запросы и повторяющийся SQL в журнал запросов."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_LOG_ENABLED:
+            return self.get_response(request)
+        collector = request._query_collector = QueryCollector()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(collector))
+            response = self.get_response(request)
+        collector.log_duplicates()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        collector = getattr(request, '_query_collector', None)
+        if collector is not None:
+            collector.view = request.resolver_match.view_name
@@ -0,0 +1,34 @@
+from django.conf import settings
+
+from core.routers import current_state, finish_request, start_request
+
+
+class ReplicaMiddleware:
+    """Отправляет чтение страниц-лент на реплики.
+
+    После запроса с записью ставит куку, и пока она жива, все запросы
+    пользователя читают с основной БД: реплика могла не догнать запись.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            finish_request()
+        if state.wrote:
+            response.set_cookie(settings.DATABASE_PIN_COOKIE, '1',
+                                max_age=settings.DATABASE_PIN_SECONDS,
+                                httponly=True)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        current_state().read_only = (
+            request.method in ('GET', 'HEAD')
+            and settings.DATABASE_PIN_COOKIE not in request.COOKIES
+            and request.resolver_match.view_name
+            in settings.DATABASE_REPLICA_VIEWS
+        )
@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+
+REFRESHED_KEY = '_session_refreshed'
+
+
+class LazySessionMiddleware(SessionMiddleware):
+    """SessionMiddleware, который продлевает сессию не на каждом запросе.
+
+    Сессия сохраняется, когда изменилась, а для продления срока —
+    не чаще раза в SESSION_REFRESH_SECONDS. None отключает продление,
+    как SESSION_SAVE_EVERY_REQUEST = False в Django.
+    """
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        interval = settings.SESSION_REFRESH_SECONDS
+        if (session is not None and interval is not None
+                and session.accessed and not session.is_empty()):
+            now = int(time.time())
+            if (session.modified
+                    or now - session.get(REFRESHED_KEY, 0) >= interval):
+                session[REFRESHED_KEY] = now
+        return super().process_response(request, response)
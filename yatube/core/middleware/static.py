@@ -0,0 +1,96 @@
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from core.storage import COMPRESSIBLE_EXTENSIONS, ENCODINGS
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме запрещённых через q=0."""
+    accepted = set()
+    for item in header.split(','):
+        encoding, _, params = item.partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(encoding.strip().lower())
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную статику из STATIC_ROOT.
+
+    Из заранее сжатых копий выбирается та, что принимает клиент.
+    Файл с хэшем в имени не меняется, поэтому браузер хранит его
+    STATIC_MAX_AGE секунд и не перепроверяет.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.hashed = set(
+            getattr(staticfiles_storage, 'hashed_files', {}).values()
+        )
+
+    def __call__(self, request):
+        if (settings.STATIC_ROOT and request.method in ('GET', 'HEAD')
+                and request.path_info.startswith(settings.STATIC_URL)):
+            name = request.path_info[len(settings.STATIC_URL):]
+            response = self.serve(request, name)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        if not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'),
+            stat.st_mtime, stat.st_size,
+        ):
+            response = HttpResponseNotModified()
+        else:
+            response = self.file_response(request, name, path)
+        if name in self.hashed:
+            response['Cache-Control'] = (
+                f'public, max-age={settings.STATIC_MAX_AGE}, immutable'
+            )
+        else:
+            response['Cache-Control'] = 'public, max-age=60'
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+            response['Vary'] = 'Accept-Encoding'
+        return response
+
+    def file_response(self, request, name, path):
+        content_type = (mimetypes.guess_type(name)[0]
+                        or 'application/octet-stream')
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        for encoding, suffix, _ in ENCODINGS:
+            if ((encoding in accepted or '*' in accepted)
+                    and os.path.isfile(path + suffix)):
+                response = FileResponse(open(path + suffix, 'rb'),
+                                        content_type=content_type)
+                response['Content-Encoding'] = encoding
+                return response
+        return FileResponse(open(path, 'rb'),
+                            content_type=content_type)
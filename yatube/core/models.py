@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class QueuedTask(models.Model):
+    name = models.CharField(max_length=200, verbose_name='Задача')
+    args = models.TextField(verbose_name='Аргументы в JSON')
+    attempts = models.PositiveIntegerField(default=0,
+                                           verbose_name='Попыток')
+    run_after = models.DateTimeField(db_index=True,
+                                     verbose_name='Выполнить после')
+    failed = models.BooleanField(default=False,
+                                 verbose_name='Попытки исчерпаны')
+    last_error = models.TextField(blank=True,
+                                  verbose_name='Последняя ошибка')
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Задача в очереди'
+        verbose_name_plural = 'Задачи в очереди'
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,176 @@
+import bisect
+import threading
+import time
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.memcached import MemcachedCache
+from django.template.backends.django import DjangoTemplates, Template
+
+# Границы корзин гистограммы времени ответа, мс.
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_local = threading.local()
+
+
+class RequestProfile:
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.total_time = 0.0
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.sql_time += time.perf_counter() - started
+
+    def server_timing(self):
+        return ', '.join((
+            f'total;dur={self.total_time * 1000:.1f}',
+            f'sql;dur={self.sql_time * 1000:.1f};'
+            f'desc="{self.sql_count} queries"',
+            f'tpl;dur={self.template_time * 1000:.1f}',
+            f'cache;desc="{self.cache_hits} hits, '
+            f'{self.cache_misses} misses"',
+        ))
+
+
+def start_profile():
+    _local.profile = RequestProfile()
+    return _local.profile
+
+
+def stop_profile():
+    _local.profile = None
+
+
+def current_profile():
+    return getattr(_local, 'profile', None)
+
+
+class ViewStats:
+    def __init__(self):
+        self.requests = 0
+        self.histogram = [0] * (len(BUCKETS) + 1)
+        self.total_time = 0.0
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(self, profile):
+        self.requests += 1
+        self.histogram[
+            bisect.bisect_left(BUCKETS, profile.total_time * 1000)
+        ] += 1
+        self.total_time += profile.total_time
+        self.sql_count += profile.sql_count
+        self.sql_time += profile.sql_time
+        self.template_time += profile.template_time
+        self.cache_hits += profile.cache_hits
+        self.cache_misses += profile.cache_misses
+
+    @property
+    def average_total_ms(self):
+        return self.total_time * 1000 / self.requests
+
+    @property
+    def average_sql_ms(self):
+        return self.sql_time * 1000 / self.requests
+
+    @property
+    def average_template_ms(self):
+        return self.template_time * 1000 / self.requests
+
+    @property
+    def average_queries(self):
+        return self.sql_count / self.requests
+
+    @property
+    def buckets(self):
+        labels = [f'≤{bound}' for bound in BUCKETS] + [f'>{BUCKETS[-1]}']
+        return list(zip(labels, self.histogram))
+
+
+class ProfileStats:
+    """Агрегаты по имени URL в памяти процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def record(self, view_name, profile):
+        with self.lock:
+            self.views.setdefault(view_name, ViewStats()).add(profile)
+
+    def snapshot(self):
+        with self.lock:
+            return sorted(self.views.items())
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+
+
+stats = ProfileStats()
+
+
+class ProfilingCacheMixin:
+    """Считает попадания и промахи кэша в профиль текущего запроса."""
+
+    def get(self, key, default=None, version=None):
+        missing = object()
+        value = super().get(key, missing, version)
+        self._count(hits=int(value is not missing),
+                    misses=int(value is missing))
+        return default if value is missing else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version)
+        self._count(hits=len(values), misses=len(keys) - len(values))
+        return values
+
+    @staticmethod
+    def _count(hits, misses):
+        profile = current_profile()
+        if profile is not None:
+            profile.cache_hits += hits
+            profile.cache_misses += misses
+
+
+class ProfilingLocMemCache(ProfilingCacheMixin, LocMemCache):
+    pass
+
+
+class ProfilingMemcachedCache(ProfilingCacheMixin, MemcachedCache):
+    pass
+
+
+class ProfilingTemplate(Template):
+    def render(self, context=None, request=None):
+        profile = current_profile()
+        if profile is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            profile.template_time += time.perf_counter() - started
+
+
+class ProfilingDjangoTemplates(DjangoTemplates):
+    """Бэкенд шаблонов Django, замеряющий время отрисовки."""
+
+    def from_string(self, template_code):
+        return ProfilingTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return ProfilingTemplate(template.template, self)
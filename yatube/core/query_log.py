@@ -0,0 +1,119 @@
+import json
+import logging
+import os
+import sys
+import time
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+
+logger = logging.getLogger('yatube.queries')
+
+DJANGO_DIR = os.path.dirname(os.path.dirname(sys.modules['django'].__file__))
+PROJECT_DIR = settings.BASE_DIR
+
+
+def query_location():
+    """Строка кода проекта и строка шаблона, откуда пришёл запрос."""
+    code = template = None
+    frame = sys._getframe(1)
+    while frame is not None and (code is None or template is None):
+        filename = frame.f_code.co_filename
+        if template is None and frame.f_code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            token = getattr(node, 'token', None)
+            origin = getattr(node, 'origin', None)
+            if token is not None and origin is not None:
+                name = origin.template_name or origin.name
+                template = f'{name}:{token.lineno}'
+        elif (code is None and filename.startswith(PROJECT_DIR)
+              and not filename.startswith(DJANGO_DIR)
+              and filename != __file__):
+            code = f'{os.path.relpath(filename, PROJECT_DIR)}:' \
+                   f'{frame.f_lineno}'
+        frame = frame.f_back
+    return {'code': code, 'template': template}
+
+
+def loggable_params(sql):
+    """Можно ли писать параметры запроса в журнал.
+
+    Только для SELECT и не к таблицам из QUERY_LOG_SENSITIVE_TABLES:
+    в записи попадают хэши паролей, данные сессий и тексты постов.
+    """
+    statement = sql.lstrip()[:6].upper()
+    return statement == 'SELECT' and not any(
+        table in sql for table in settings.QUERY_LOG_SENSITIVE_TABLES
+    )
+
+
+class QueryCollector:
+    """execute_wrapper: пишет медленные запросы и считает повторы SQL."""
+
+    def __init__(self, view=None, slow_ms=None):
+        self.view = view
+        self.slow_ms = (settings.QUERY_LOG_SLOW_MS if slow_ms is None
+                        else slow_ms)
+        self.seen = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            self.count(sql, params)
+            if duration >= self.slow_ms:
+                logger.warning('slow_query', extra={'data': {
+                    'view': self.view,
+                    'sql': sql,
+                    'params': ([str(param) for param in params or ()]
+                               if loggable_params(sql) else None),
+                    'duration_ms': round(duration, 2),
+                    **query_location(),
+                }})
+
+    def count(self, sql, params):
+        entry = self.seen.get(sql)
+        if entry is None:
+            self.seen[sql] = {'count': 1, 'params': {repr(params)},
+                              'location': None}
+            return
+        entry['count'] += 1
+        entry['params'].add(repr(params))
+        if entry['location'] is None:
+            entry['location'] = query_location()
+
+    def duplicates(self, threshold=None):
+        threshold = threshold or settings.QUERY_LOG_DUPLICATE_THRESHOLD
+        return [
+            {'sql': sql, 'count': entry['count'],
+             'distinct_params': len(entry['params']), **entry['location']}
+            for sql, entry in self.seen.items()
+            if entry['count'] >= threshold
+        ]
+
+    def log_duplicates(self):
+        for duplicate in self.duplicates():
+            logger.warning('duplicate_query', extra={'data': {
+                'view': self.view, **duplicate,
+            }})
+
+
+class QueryLogHandler(RotatingFileHandler):
+    """Создаёт каталог журнала при первой записи, а не при запуске."""
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class JSONFormatter(logging.Formatter):
+    """Одна запись — одна строка JSON."""
+
+    def format(self, record):
+        return json.dumps({
+            'time': self.formatTime(record),
+            'event': record.getMessage(),
+            **getattr(record, 'data', {}),
+        }, ensure_ascii=False)
@@ -0,0 +1,95 @@
+import contextlib
+import random
+import threading
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+_local = threading.local()
+
+
+class RequestDatabaseState:
+    def __init__(self):
+        # Читать с реплик: выставляет ReplicaMiddleware для страниц
+        # из DATABASE_REPLICA_VIEWS.
+        self.read_only = False
+        self.wrote = False
+
+
+def start_request():
+    _local.state = RequestDatabaseState()
+    return _local.state
+
+
+def finish_request():
+    _local.state = None
+
+
+def current_state():
+    return getattr(_local, 'state', None)
+
+
+def reads_from_replicas():
+    state = current_state()
+    return (state is not None and state.read_only and not state.wrote
+            and bool(settings.DATABASE_REPLICAS))
+
+
+def cache_timeout(timeout):
+    """Срок хранения в общем кэше того, что прочитано в этом запросе.
+
+    Прочитанное с реплики хранится не дольше DATABASE_PIN_SECONDS:
+    за это время реплика догоняет запись, и устаревшая копия сменится.
+    """
+    if not reads_from_replicas():
+        return timeout
+    if timeout is None:
+        return settings.DATABASE_PIN_SECONDS
+    return min(timeout, settings.DATABASE_PIN_SECONDS)
+
+
+@contextlib.contextmanager
+def primary_reads():
+    """Чтение с основной БД для долгоживущих записей общего кэша.
+
+    Для кэша объектов и собранных лент, которые не привязаны к версии
+    ленты: отставшая реплика заполнила бы их устаревшими данными
+    надолго. Работает и как декоратор.
+    """
+    state = current_state()
+    read_only = state is not None and state.read_only
+    if read_only:
+        state.read_only = False
+    try:
+        yield
+    finally:
+        if read_only:
+            state.read_only = True
+
+
+class ReplicaRouter:
+    """Чтение страниц-лент с реплик, всё остальное — с основной БД.
+
+    После записи чтение в том же запросе тоже идёт с основной БД,
+    чтобы пользователь сразу увидел свои изменения. Долгоживущий кэш
+    заполняется с основной БД (primary_reads), остальное прочитанное
+    с реплики кэшируется ненадолго (cache_timeout).
+    """
+
+    def db_for_read(self, model, **hints):
+        if not reads_from_replicas():
+            return PRIMARY
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = current_state()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == PRIMARY
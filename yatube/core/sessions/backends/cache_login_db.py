@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import \
+    SessionStore as CachedDBStore
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+
+KEY_PREFIX = 'core.sessions.cache_login_db'
+DB_SAVED_KEY = '_session_db_saved'
+
+
+class SessionStore(CachedDBStore):
+    """Сессии в кэше; в БД пишутся только вход и выход.
+
+    Строка в БД обновляется при создании сессии и когда меняются ключи
+    из SESSION_DB_KEYS (вход, выход, смена пароля), выход удаляет её.
+    Прочие изменения живут только в кэше. Если кэш потерял сессию,
+    она читается из БД: пользователь остаётся в системе, но данные,
+    записанные после входа, теряются. Кэш должен быть общим для всех
+    процессов, иначе выход не закроет сессию в других процессах.
+
+    Срок строки в БД продлевается, когда с прошлой записи прошла
+    половина срока сессии: иначе clearsessions удалил бы сессию,
+    которую кэш ещё продлевает.
+    """
+
+    cache_key_prefix = KEY_PREFIX
+
+    def load(self):
+        data = super().load()
+        self._db_values = self.db_values(data)
+        return data
+
+    def db_values(self, data):
+        return {key: data.get(key) for key in settings.SESSION_DB_KEYS}
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        values = self.db_values(data)
+        now = int(time.time())
+        db_expiring = (now - data.get(DB_SAVED_KEY, 0)
+                       >= self.get_expiry_age() / 2)
+        if (must_create or db_expiring
+                or values != getattr(self, '_db_values', None)):
+            data[DB_SAVED_KEY] = now
+            DBStore.save(self, must_create)
+            self._db_values = values
+        self._cache.set(self.cache_key, self._session, self.get_expiry_age())
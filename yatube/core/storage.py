@@ -0,0 +1,57 @@
+import gzip
+
+import brotli
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+# Сжимается только текст: картинки и шрифты уже сжаты.
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.json', '.svg', '.ico', '.txt', '.html', '.xml',
+)
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+def compress_gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+# Сжатые копии лежат рядом с файлом; порядок — предпочтение при отдаче.
+ENCODINGS = (
+    ('br', '.br', compress_brotli),
+    ('gzip', '.gz', compress_gzip),
+)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хэшем содержимого в имени и заранее сжатыми копиями.
+
+    После collectstatic рядом с каждым текстовым файлом лежат .br и .gz,
+    если они меньше исходного. Отдаёт их core.middleware.static.
+    """
+
+    def stored_name(self, name):
+        # Пока collectstatic не запускали, манифеста нет: имена без хэша.
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if not dry_run:
+            for name in set(self.hashed_files.values()):
+                self.compress(name)
+
+    def compress(self, name):
+        if not name.lower().endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as original:
+            data = original.read()
+        for _, suffix, compress in ENCODINGS:
+            compressed = compress(data)
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            if len(compressed) < len(data):
+                self._save(name + suffix, ContentFile(compressed))
@@ -0,0 +1,154 @@
+import json
+import logging
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('yatube.tasks')
+
+registry = {}
+
+
+class Task:
+    def __init__(self, func, retries, backoff):
+        self.func = func
+        self.name = f'{func.__module__}.{func.__name__}'
+        self.retries = retries
+        self.backoff = backoff
+
+    def __call__(self, *args):
+        return self.func(*args)
+
+    def delay(self, *args):
+        """Ставит задачу в очередь, когда текущая транзакция зафиксирована.
+
+        Аргументы должны сериализоваться в JSON: очередь может жить в БД.
+        """
+        if settings.TASKS_EAGER:
+            self.func(*args)
+            return
+        transaction.on_commit(
+            lambda: get_backend().enqueue(self.name, list(args))
+        )
+
+
+def task(retries=3, backoff=0.5):
+    """Регистрирует функцию как фоновую задачу с повторами."""
+    def decorator(func):
+        registered = Task(func, retries, backoff)
+        registry[registered.name] = registered
+        return registered
+    return decorator
+
+
+class ThreadPoolBackend:
+    """Задачи в потоках текущего процесса.
+
+    При одном потоке (по умолчанию) задачи выполняются в порядке
+    постановки, то есть в порядке фиксации транзакций.
+    """
+
+    def __init__(self, threads=1):
+        self.executor = ThreadPoolExecutor(threads,
+                                           thread_name_prefix='tasks')
+        self.futures = set()
+
+    def enqueue(self, name, args):
+        future = self.executor.submit(self.run, name, args)
+        self.futures.add(future)
+        future.add_done_callback(self.futures.discard)
+
+    def run(self, name, args):
+        registered = registry[name]
+        for attempt in range(registered.retries + 1):
+            close_old_connections()
+            try:
+                registered(*args)
+                return
+            except Exception:
+                logger.warning('Задача %s%r: попытка %s не удалась',
+                               name, args, attempt + 1, exc_info=True)
+                if attempt < registered.retries:
+                    time.sleep(registered.backoff * 2 ** attempt)
+            finally:
+                close_old_connections()
+        logger.error('Задача %s%r: попытки исчерпаны', name, args)
+
+    def wait(self):
+        wait(list(self.futures))
+
+
+class DatabaseBackend:
+    """Очередь в таблице QueuedTask, выполняет команда run_tasks.
+
+    Обработчик забирает задачу одним UPDATE и выполняет её вне
+    транзакции, поэтому долгая задача не держит блокировку записи.
+    Задачу упавшего обработчика через lease секунд возьмёт другой.
+    """
+
+    def __init__(self, lease=300, **options):
+        self.lease = lease
+
+    def enqueue(self, name, args):
+        from .models import QueuedTask
+
+        QueuedTask.objects.create(name=name, args=json.dumps(args),
+                                  run_after=timezone.now())
+
+    def claim(self):
+        """Забирает самую старую готовую задачу, None — если таких нет."""
+        from .models import QueuedTask
+
+        while True:
+            now = timezone.now()
+            queued = QueuedTask.objects.filter(
+                failed=False, run_after__lte=now
+            ).first()
+            if queued is None:
+                return None
+            # Из нескольких обработчиков строку обновит только один.
+            claimed = QueuedTask.objects.filter(
+                pk=queued.pk, run_after=queued.run_after
+            ).update(run_after=now + timedelta(seconds=self.lease),
+                     attempts=F('attempts') + 1)
+            if claimed:
+                queued.attempts += 1
+                return queued
+
+    def run_next(self):
+        """Выполняет самую старую готовую задачу, False — если таких нет."""
+        queued = self.claim()
+        if queued is None:
+            return False
+        registered = registry[queued.name]
+        try:
+            registered(*json.loads(queued.args))
+        except Exception:
+            logger.warning('Задача %s: попытка %s не удалась',
+                           queued, queued.attempts, exc_info=True)
+            queued.last_error = traceback.format_exc()
+            queued.failed = queued.attempts > registered.retries
+            queued.run_after = timezone.now() + timedelta(
+                seconds=registered.backoff * 2 ** (queued.attempts - 1)
+            )
+            queued.save(update_fields=['last_error', 'failed', 'run_after'])
+        else:
+            queued.delete()
+        return True
+
+
+@lru_cache(maxsize=None)
+def load_backend(path):
+    return import_string(path)(**settings.TASKS_OPTIONS)
+
+
+def get_backend():
+    return load_backend(settings.TASKS_BACKEND)
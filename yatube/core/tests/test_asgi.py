@@ -0,0 +1,225 @@
+import asyncio
+import threading
+from http import HTTPStatus
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from ..asgi import ASGIHandler, wsgi_environ
+
+
+def call(application, scope, body=b''):
+    """Прогоняет один HTTP-запрос через ASGI-приложение."""
+    messages = [{'type': 'http.request', 'body': body}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # Как у настоящего сервера: ждём, пока клиент на связи.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return sent
+
+
+def http_scope(path, method='GET', query_string=b'', headers=()):
+    return {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': list(headers),
+        'client': ('127.0.0.1', 40000),
+        'server': ('testserver', 80),
+    }
+
+
+class Streaming:
+    streaming = True
+    closed = False
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def close(self):
+        self.closed = True
+
+
+class ASGIHandlerTests(SimpleTestCase):
+    def test_scope_becomes_wsgi_environ(self):
+        """Путь, строка запроса, заголовки и тело доходят до WSGI."""
+        environ = {}
+
+        def application(wsgi_environ, start_response):
+            environ.update(wsgi_environ)
+            environ['body'] = wsgi_environ['wsgi.input'].read()
+            start_response('201 Created', [('X-Test', 'yes')])
+            return [b'ok']
+
+        sent = call(ASGIHandler(application, threads=1), http_scope(
+            '/группа/', method='POST', query_string=b'page=2',
+            headers=[(b'content-type', b'text/plain'),
+                     (b'x-forwarded-for', b'10.0.0.1')],
+        ), body=b'text')
+        self.assertEqual(environ['REQUEST_METHOD'], 'POST')
+        self.assertEqual(environ['PATH_INFO'].encode('latin-1').decode(),
+                         '/группа/')
+        self.assertEqual(environ['QUERY_STRING'], 'page=2')
+        self.assertEqual(environ['CONTENT_TYPE'], 'text/plain')
+        self.assertEqual(environ['HTTP_X_FORWARDED_FOR'], '10.0.0.1')
+        self.assertEqual(environ['body'], b'text')
+        self.assertEqual(sent[0]['status'], HTTPStatus.CREATED)
+        self.assertIn((b'x-test', b'yes'), sent[0]['headers'])
+        self.assertEqual(sent[1]['body'], b'ok')
+
+    def test_disconnect_before_body_skips_request(self):
+        """Запрос без дошедшего тела не выполняется."""
+        calls = []
+
+        def application(wsgi_environ, start_response):
+            calls.append(wsgi_environ)
+            start_response('200 OK', [])
+            return [b'ok']
+
+        messages = [{'type': 'http.disconnect'},
+                    {'type': 'http.request', 'body': b'part',
+                     'more_body': True}]
+        sent = []
+
+        async def receive():
+            return messages.pop()
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(ASGIHandler(application, threads=1)(
+            http_scope('/', method='POST'), receive, send))
+        self.assertEqual(calls, [])
+        self.assertEqual(sent, [])
+
+    def disconnect(self, application, after_body=None):
+        """Клиент отключается сразу или после куска ответа after_body.
+
+        Приложение строится вокруг события left: оно наступает, когда
+        обработчик получил отключение.
+        """
+        messages = [{'type': 'http.request', 'body': b''}]
+        left = threading.Event()
+        sent = []
+
+        async def run():
+            leaving = asyncio.Event()
+            if after_body is None:
+                leaving.set()
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await leaving.wait()
+                left.set()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                sent.append(message)
+                if after_body is not None and \
+                        message.get('body') == after_body:
+                    leaving.set()
+
+            await ASGIHandler(application(left), threads=1)(
+                http_scope('/'), receive, send)
+
+        asyncio.run(run())
+        return sent
+
+    def test_disconnect_during_view_skips_response(self):
+        """Клиенту, ушедшему во время представления, ответ не шлётся."""
+        def application(left):
+            def wsgi(environ, start_response):
+                left.wait(5)
+                start_response('200 OK', [])
+                return [b'ok']
+            return wsgi
+
+        sent = self.disconnect(application)
+        self.assertEqual(sent, [])
+
+    def test_disconnect_stops_streaming(self):
+        """После отключения куски потокового ответа не читаются."""
+        produced = []
+
+        def chunks(left):
+            yield b'a'
+            left.wait(5)
+            for chunk in (b'b', b'c'):
+                produced.append(chunk)
+                yield chunk
+
+        response = None
+
+        def application(left):
+            def wsgi(environ, start_response):
+                nonlocal response
+                response = Streaming(chunks(left))
+                start_response('200 OK', [])
+                return response
+            return wsgi
+
+        sent = self.disconnect(application, after_body=b'a')
+        self.assertEqual([message.get('body') for message in sent[1:]],
+                         [b'a'])
+        self.assertEqual(produced, [b'b'])
+        self.assertTrue(response.closed)
+
+    def test_repeated_cookie_headers(self):
+        """Повторные Cookie склеиваются через точку с запятой."""
+        environ = wsgi_environ(http_scope('/', headers=[
+            (b'cookie', b'a=1'), (b'cookie', b'b=2'),
+            (b'accept', b'text/html'), (b'accept', b'*/*'),
+        ]), None)
+        self.assertEqual(environ['HTTP_COOKIE'], 'a=1; b=2')
+        self.assertEqual(environ['HTTP_ACCEPT'], 'text/html,*/*')
+
+    def test_streaming_response_is_sent_by_chunks(self):
+        """Потоковый ответ уходит по кускам и закрывается."""
+        response = Streaming([b'a', b'b'])
+
+        def application(environ, start_response):
+            start_response('200 OK', [])
+            return response
+
+        sent = call(ASGIHandler(application, threads=1), http_scope('/'))
+        self.assertEqual([message.get('body') for message in sent[1:]],
+                         [b'a', b'b', b''])
+        self.assertTrue(response.closed)
+
+    def test_django_page(self):
+        """Страница Django отдаётся через ASGI."""
+        sent = call(ASGIHandler(threads=1),
+                    http_scope(reverse('about:author')))
+        self.assertEqual(sent[0]['status'], HTTPStatus.OK)
+        self.assertIn(b'text/html',
+                      dict(sent[0]['headers'])[b'content-type'])
+
+    def test_lifespan(self):
+        """Сервер получает подтверждение запуска и остановки."""
+        messages = [{'type': 'lifespan.shutdown'},
+                    {'type': 'lifespan.startup'}]
+        sent = []
+
+        async def receive():
+            return messages.pop()
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(ASGIHandler(threads=1)({'type': 'lifespan'},
+                                           receive, send))
+        self.assertEqual(sent, ['lifespan.startup.complete',
+                                'lifespan.shutdown.complete'])
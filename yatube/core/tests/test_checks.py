@@ -0,0 +1,23 @@
+from django.test import SimpleTestCase, override_settings
+
+from ..checks import check_shared_cache
+
+MEMCACHED = {
+    'default': {
+        'BACKEND': 'core.profiling.ProfilingMemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+    }
+}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_local_cache_warns(self):
+        """Локальный кэш процесса даёт предупреждение для деплоя."""
+        warnings = check_shared_cache(None)
+        self.assertEqual([warning.id for warning in warnings],
+                         ['core.W001'])
+
+    @override_settings(CACHES=MEMCACHED)
+    def test_shared_cache_passes(self):
+        """С memcached предупреждения нет."""
+        self.assertEqual(check_shared_cache(None), [])
@@ -0,0 +1,71 @@
+import gzip
+
+import brotli
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from ..middleware.compression import minify_html
+
+
+class MinifyTests(TestCase):
+    def test_indentation_removed(self):
+        """Отступы и пустые строки сводятся к переводу строки."""
+        self.assertEqual(
+            minify_html(b'<ul>\n    <li>a  b</li>\n\n  </ul> \n'),
+            b'<ul>\n<li>a  b</li>\n</ul>\n',
+        )
+
+    def test_preformatted_kept(self):
+        """Содержимое pre, textarea и script не меняется."""
+        for content in (b'<pre>\n  a\n\n  b\n</pre>',
+                        b'<TEXTAREA name="text">\n  a\n</TEXTAREA>',
+                        b'<script>\n  let a;\n</script>'):
+            with self.subTest(content=content):
+                self.assertEqual(minify_html(b'<p>\n  ' + content),
+                                 b'<p>\n' + content)
+
+
+class CompressionMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        user = User.objects.create_user(username='author')
+        Post.objects.bulk_create(
+            Post(text=f'Тестовый пост {number}', author=user)
+            for number in range(10)
+        )
+
+    def get(self, encoding=''):
+        return self.client.get(reverse('posts:index'),
+                               HTTP_ACCEPT_ENCODING=encoding)
+
+    def test_compressed_by_accepted_encoding(self):
+        """Страница сжимается кодировкой, которую принимает клиент."""
+        for header, encoding, decompress in (
+            ('gzip, deflate, br', 'br', brotli.decompress),
+            ('gzip', 'gzip', gzip.decompress),
+        ):
+            with self.subTest(header=header):
+                response = self.get(header)
+                self.assertEqual(response['Content-Encoding'], encoding)
+                self.assertEqual(response['Vary'],
+                                 'Cookie, Accept-Encoding')
+                self.assertEqual(int(response['Content-Length']),
+                                 len(response.content))
+                self.assertTrue(response['ETag'].startswith('W/"'))
+                content = decompress(response.content).decode()
+                self.assertIn('Тестовый пост 9', content)
+
+    def test_minified_without_compression(self):
+        """Без Accept-Encoding страница только минифицирована."""
+        response = self.get()
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn(b'\n  ', response.content)
+        self.assertContains(response, 'Тестовый пост 9')
+
+    @override_settings(COMPRESSION_MIN_LENGTH=10 ** 6)
+    def test_short_response_not_compressed(self):
+        """Короткий ответ не сжимается."""
+        self.assertFalse(self.get('br').has_header('Content-Encoding'))
@@ -0,0 +1,29 @@
+import datetime
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..context_processors.cached import time_bucketed
+from ..context_processors.year import year
+
+
+class ContextProcessorTests(SimpleTestCase):
+    def test_year(self):
+        """Процессор отдаёт текущий год."""
+        self.assertEqual(year(None), {'year': datetime.date.today().year})
+
+    def test_time_bucketed_value_is_cached(self):
+        """Значение пересчитывается только в новом интервале."""
+        calls = []
+
+        @time_bucketed(60)
+        def value():
+            calls.append(1)
+            return len(calls)
+
+        with mock.patch('time.time', return_value=120):
+            self.assertEqual(value(), 1)
+        with mock.patch('time.time', return_value=179):
+            self.assertEqual(value(), 1)
+        with mock.patch('time.time', return_value=180):
+            self.assertEqual(value(), 2)
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.template import Context, Engine
+from django.test import SimpleTestCase, override_settings
+
+from ..loaders import template_names, warm_up
+
+TEMPLATES = {
+    'base.html': ('<h1>{% block title %}{% endblock %}</h1>'
+                  '{% include "parts/item.html" %}'),
+    'page.html': ('{% extends "base.html" %}'
+                  '{% block title %}{{ title|upper }}{% endblock %}'),
+    'parts/item.html': ('{% if items and not hidden %}'
+                        '{% for item in items %}<i>{{ item }}</i>{% endfor %}'
+                        '{% elif hidden %}скрыто{% endif %}'),
+}
+CONTEXT = {'title': 'лента', 'items': [1, 2], 'hidden': False}
+
+
+class TemplateBundleTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        for name, source in TEMPLATES.items():
+            self.write(name, source)
+        self.bundle = os.path.join(self.directory, 'templates.bundle')
+        override = override_settings(TEMPLATES_BUNDLE=self.bundle)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def write(self, name, source):
+        path = os.path.join(self.directory, 'templates', name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(source)
+
+    def engine(self):
+        return Engine(
+            dirs=[os.path.join(self.directory, 'templates')],
+            loaders=[('core.loaders.Loader',
+                      ['django.template.loaders.filesystem.Loader'])],
+        )
+
+    def render(self, engine):
+        return engine.get_template('page.html').render(Context(CONTEXT))
+
+    def write_bundle(self):
+        engine = self.engine()
+        engine.template_loaders[0].write_bundle(self.bundle,
+                                                warm_up(engine))
+        return engine
+
+    def test_warm_up_compiles_all_templates(self):
+        """Прогрев компилирует все шаблоны из каталогов."""
+        engine = self.engine()
+        self.assertEqual(template_names(engine), sorted(TEMPLATES))
+        warm_up(engine)
+        self.assertEqual(
+            sorted(engine.template_loaders[0].get_template_cache),
+            sorted(TEMPLATES),
+        )
+
+    def test_bundle_loaded_at_start(self):
+        """Шаблоны из набора готовы сразу и отрисовываются так же."""
+        expected = self.render(self.write_bundle())
+        engine = self.engine()
+        self.assertEqual(
+            sorted(engine.template_loaders[0].get_template_cache),
+            sorted(TEMPLATES),
+        )
+        self.assertEqual(self.render(engine), expected)
+        self.assertEqual(expected, '<h1>ЛЕНТА</h1><i>1</i><i>2</i>')
+
+    def test_changed_template_recompiled(self):
+        """Изменённый после сборки набора шаблон компилируется заново."""
+        self.write_bundle()
+        self.write('page.html', '{% extends "base.html" %}')
+        engine = self.engine()
+        self.assertNotIn('page.html',
+                         engine.template_loaders[0].get_template_cache)
+        self.assertEqual(self.render(engine), '<h1></h1><i>1</i><i>2</i>')
+
+    def test_bundle_of_other_version_ignored(self):
+        """Набор другой версии Django не используется."""
+        self.write_bundle()
+        with mock.patch('django.get_version', return_value='0.0'):
+            loader = self.engine().template_loaders[0]
+        self.assertEqual(loader.get_template_cache, {})
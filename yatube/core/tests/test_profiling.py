@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from ..profiling import stats
+
+
+@override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_SERVER_TIMING=True)
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='user')
+        cls.staff = User.objects.create_user(username='staff',
+                                             is_staff=True)
+        Post.objects.create(text='Текстовый пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        stats.reset()
+        self.guest_client = Client()
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def test_server_timing_header(self):
+        """Ответ содержит Server-Timing с SQL, шаблонами и кэшем."""
+        response = self.staff_client.get(reverse('posts:index'))
+        timing = response['Server-Timing']
+        for metric in ('total;dur=', 'sql;dur=', 'tpl;dur=', 'cache;desc='):
+            with self.subTest(metric=metric):
+                self.assertIn(metric, timing)
+        self.assertNotIn('desc="0 queries"', timing)
+
+    def test_server_timing_staff_only(self):
+        """Гостям и обычным пользователям Server-Timing не отдаётся."""
+        user_client = Client()
+        user_client.force_login(self.user)
+        for client in (self.guest_client, user_client):
+            response = client.get(reverse('posts:index'))
+            self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(PROFILING_SERVER_TIMING=False)
+    def test_server_timing_disabled(self):
+        """Без PROFILING_SERVER_TIMING заголовка нет и у персонала."""
+        response = self.staff_client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_cache_hits_counted(self):
+        """Повторный запрос ленты попадает в кэш фрагмента."""
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        self.guest_client.get(url)
+        view = dict(stats.snapshot())['posts:index']
+        self.assertEqual(view.requests, 2)
+        self.assertGreater(view.cache_hits, 0)
+        self.assertGreater(view.template_time, 0)
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_unsampled_requests_untouched(self):
+        """Запросы вне выборки не профилируются."""
+        response = self.guest_client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertEqual(stats.snapshot(), [])
+
+    def test_stats_page_staff_only(self):
+        """Страница статистики доступна только персоналу."""
+        self.guest_client.get(reverse('posts:index'))
+        url = reverse('core:profiling_stats')
+        response = self.guest_client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        response = self.staff_client.get(url)
+        self.assertContains(response, 'posts:index')
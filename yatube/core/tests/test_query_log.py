@@ -0,0 +1,99 @@
+import logging
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.template import engines
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from ..query_log import JSONFormatter, QueryCollector, QueryLogHandler
+
+
+class QueryLogTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        for i in range(5):
+            user = User.objects.create_user(username=f'user{i}')
+            Post.objects.create(text=f'Пост {i}', author=user)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_template_n_plus_one_detected(self):
+        """Повторы SQL из цикла шаблона найдены с номером строки."""
+        template = engines['django'].from_string(
+            '{% for post in posts %}\n{{ post.author.username }}\n'
+            '{% endfor %}'
+        )
+        collector = QueryCollector(view='test')
+        with connection.execute_wrapper(collector):
+            template.render({'posts': Post.objects.all()})
+        duplicates = collector.duplicates(threshold=5)
+        self.assertEqual(len(duplicates), 1)
+        self.assertEqual(duplicates[0]['count'], 5)
+        self.assertEqual(duplicates[0]['distinct_params'], 5)
+        self.assertTrue(duplicates[0]['template'].endswith(':2'))
+
+    @override_settings(QUERY_LOG_SLOW_MS=0)
+    def test_middleware_logs_slow_queries_with_view(self):
+        """Медленные запросы пишутся в журнал с именем представления."""
+        with self.assertLogs('yatube.queries') as logs:
+            Client().get(reverse('posts:index'))
+        records = [record for record in logs.records
+                   if record.getMessage() == 'slow_query']
+        self.assertTrue(records)
+        self.assertEqual(records[-1].data['view'], 'posts:index')
+        self.assertIn('posts_post', records[-1].data['sql'])
+
+    def test_sensitive_params_are_not_logged(self):
+        """Параметры записей и запросов к auth_user не попадают в журнал."""
+        collector = QueryCollector(view='test', slow_ms=0)
+        with self.assertLogs('yatube.queries') as logs:
+            with connection.execute_wrapper(collector):
+                User.objects.create_user(username='secret',
+                                         password='пароль')
+                User.objects.filter(username='secret').exists()
+                Post.objects.filter(text='искомый').exists()
+        params = {record.data['sql'][:30]: record.data['params']
+                  for record in logs.records}
+        self.assertNotIn('пароль', str(params))
+        self.assertNotIn('secret', str(params))
+        self.assertIn(['искомый'], params.values())
+
+    def test_log_directory_created_on_first_record(self):
+        """Каталог журнала создаётся при первой записи."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'logs', 'queries.log')
+            handler = QueryLogHandler(path, delay=True)
+            self.assertFalse(os.path.exists(os.path.dirname(path)))
+            handler.emit(logging.makeLogRecord({'msg': 'slow_query'}))
+            handler.close()
+            self.assertTrue(os.path.exists(path))
+
+    def test_query_report_summarizes_log(self):
+        """Команда query_report выводит худшие запросы из журнала."""
+        formatter = JSONFormatter()
+        collector = QueryCollector(view='posts:profile', slow_ms=0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'queries.log')
+            with self.assertLogs('yatube.queries') as logs:
+                with connection.execute_wrapper(collector):
+                    for post in Post.objects.all():
+                        post.author
+                collector.log_duplicates()
+            with open(path, 'w', encoding='utf-8') as file:
+                for record in logs.records:
+                    file.write(formatter.format(record) + '\n')
+            out = StringIO()
+            call_command('query_report', '--path', path, stdout=out)
+        output = out.getvalue()
+        self.assertIn('Повторяющиеся запросы', output)
+        self.assertIn('до 5 повторов', output)
+        self.assertIn('posts:profile', output)
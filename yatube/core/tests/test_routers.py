@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from posts.objects import get_posts
+
+from ..routers import (PRIMARY, ReplicaRouter, cache_timeout, current_state,
+                       finish_request, primary_reads, start_request)
+
+reads = []
+
+
+class RecordingRouter:
+    """Запоминает, шло ли чтение на реплики, и отдаёт решение дальше."""
+
+    def db_for_read(self, model, **hints):
+        state = current_state()
+        reads.append(state is not None and state.read_only
+                     and not state.wrote)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTests(TestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.addCleanup(finish_request)
+
+    def test_reads_outside_requests_use_primary(self):
+        """Без запроса чтение идёт с основной БД."""
+        self.assertEqual(self.router.db_for_read(Post), PRIMARY)
+
+    def test_read_only_request_uses_replica(self):
+        """Страница-лента читает с реплики, пока не было записи."""
+        start_request().read_only = True
+        self.assertEqual(self.router.db_for_read(Post), 'replica')
+        self.assertEqual(self.router.db_for_write(Post), PRIMARY)
+        self.assertEqual(self.router.db_for_read(Post), PRIMARY)
+
+    def test_primary_reads_inside_block(self):
+        """Внутри primary_reads чтение идёт с основной БД."""
+        start_request().read_only = True
+        with primary_reads():
+            self.assertEqual(self.router.db_for_read(Post), PRIMARY)
+        self.assertEqual(self.router.db_for_read(Post), 'replica')
+
+    def test_replica_reads_cached_briefly(self):
+        """Прочитанное с реплики кэшируется не дольше DATABASE_PIN_SECONDS."""
+        self.assertEqual(cache_timeout(900), 900)
+        start_request().read_only = True
+        self.assertEqual(cache_timeout(900), settings.DATABASE_PIN_SECONDS)
+        self.assertEqual(cache_timeout(None), settings.DATABASE_PIN_SECONDS)
+
+    def test_migrations_only_on_primary(self):
+        """Миграции применяются только к основной БД."""
+        self.assertTrue(self.router.allow_migrate(PRIMARY, 'posts'))
+        self.assertFalse(self.router.allow_migrate('replica', 'posts'))
+
+
+@override_settings(DATABASE_ROUTERS=[
+    'core.tests.test_routers.RecordingRouter',
+    'core.routers.ReplicaRouter',
+])
+class ReplicaMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='writer')
+        cls.post = Post.objects.create(text='Тестовый пост', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        reads.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_feed_pages_read_from_replicas(self):
+        """Страницы-ленты читают с реплик."""
+        for url in (
+            reverse('posts:index'),
+            reverse('posts:profile', kwargs={'username': 'writer'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        ):
+            with self.subTest(url=url):
+                cache.clear()
+                reads.clear()
+                self.client.get(url)
+                self.assertTrue(any(reads))
+
+    def test_object_cache_filled_from_primary(self):
+        """Кэш объектов заполняется с основной БД."""
+        start_request().read_only = True
+        self.addCleanup(finish_request)
+        get_posts([self.post.pk])
+        self.assertTrue(reads)
+        self.assertFalse(any(reads))
+
+    def test_other_pages_read_from_primary(self):
+        """Формы читают с основной БД."""
+        self.authorized_client.get(reverse('posts:post_create'))
+        self.assertTrue(reads)
+        self.assertFalse(any(reads))
+
+    def test_write_pins_reads_to_primary(self):
+        """После записи пользователь читает с основной БД."""
+        response = self.authorized_client.post(
+            reverse('posts:post_create'), {'text': 'Новый пост'})
+        cookie = response.cookies[settings.DATABASE_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.DATABASE_PIN_SECONDS)
+        reads.clear()
+        self.authorized_client.get(reverse('posts:index'))
+        self.assertTrue(reads)
+        self.assertFalse(any(reads))
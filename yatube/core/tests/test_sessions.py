@@ -0,0 +1,156 @@
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (Client, RequestFactory, SimpleTestCase, TestCase,
+                         override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import User
+
+from ..middleware.sessions import REFRESHED_KEY, LazySessionMiddleware
+from ..sessions.backends.cache_login_db import SessionStore
+
+PASSWORD = 'session-password'
+
+
+def session_writes(queries):
+    return [query['sql'] for query in queries
+            if 'django_session' in query['sql']
+            and not query['sql'].startswith('SELECT')]
+
+
+@override_settings(SESSION_ENGINE='core.sessions.backends.cache_login_db')
+class CacheLoginDBSessionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader',
+                                            password=PASSWORD)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def login(self):
+        response = self.client.post(reverse('users:login'), {
+            'username': 'reader', 'password': PASSWORD,
+        })
+        self.assertEqual(response.status_code, 302)
+
+    def test_login_and_logout_write_db(self):
+        """Вход создаёт строку сессии в БД, выход удаляет её."""
+        self.login()
+        key = self.client.session.session_key
+        self.assertTrue(Session.objects.filter(session_key=key).exists())
+        self.client.get(reverse('users:logout'))
+        self.assertFalse(Session.objects.filter(session_key=key).exists())
+
+    def test_browsing_does_not_write_db(self):
+        """Просмотр страниц после входа не пишет в таблицу сессий."""
+        self.login()
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                response = self.client.get(reverse('posts:index'))
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(session_writes(queries), [])
+
+    def test_other_changes_stay_in_cache(self):
+        """Прочие изменения только в кэше, вход переживает сброс кэша."""
+        self.login()
+        session = SessionStore(self.client.session.session_key)
+        session['theme'] = 'dark'
+        with CaptureQueriesContext(connection) as queries:
+            session.save()
+        self.assertEqual(session_writes(queries), [])
+        self.assertEqual(SessionStore(session.session_key)['theme'], 'dark')
+        cache.clear()
+        restored = SessionStore(session.session_key)
+        self.assertNotIn('theme', restored)
+        self.assertEqual(restored['_auth_user_id'], str(self.user.pk))
+
+    @override_settings(SESSION_COOKIE_AGE=100)
+    def test_db_expiry_follows_cache(self):
+        """Срок строки в БД продлевается раз в половину срока сессии."""
+        def save_at(seconds, key=None):
+            moment = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            moment += timedelta(seconds=seconds)
+            with mock.patch('django.utils.timezone.now',
+                            return_value=moment), \
+                    mock.patch('core.sessions.backends.cache_login_db.'
+                               'time.time', return_value=moment.timestamp()):
+                session = SessionStore(key)
+                session['theme'] = seconds
+                session.save()
+            return session.session_key
+
+        def expire_date(key):
+            return Session.objects.get(session_key=key).expire_date
+
+        key = save_at(0)
+        created = expire_date(key)
+        save_at(49, key)
+        self.assertEqual(expire_date(key), created)
+        save_at(50, key)
+        self.assertEqual(expire_date(key), created + timedelta(seconds=50))
+
+
+class SessionModeSettingsTests(SimpleTestCase):
+    def import_settings(self, **environ):
+        return subprocess.run(
+            [sys.executable, '-c', 'import yatube.settings'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+            env={**os.environ, 'CACHE_LOCATION': '', **environ},
+        )
+
+    def test_cache_mode_requires_shared_cache(self):
+        """Режим cache без общего кэша не запускается."""
+        result = self.import_settings(SESSION_MODE='cache')
+        self.assertNotEqual(result.returncode, 0)
+        self.assertIn('CACHE_LOCATION', result.stderr)
+
+    def test_shared_cache_enables_cache_mode(self):
+        """С общим кэшем режим cache разрешён."""
+        result = self.import_settings(SESSION_MODE='cache',
+                                      CACHE_LOCATION='127.0.0.1:11211')
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+@override_settings(SESSION_ENGINE='core.sessions.backends.cache_login_db',
+                   SESSION_REFRESH_SECONDS=60)
+class LazySessionMiddlewareTests(SimpleTestCase):
+    def process(self, session):
+        request = RequestFactory().get('/')
+        request.session = session
+        middleware = LazySessionMiddleware(lambda request: HttpResponse())
+        return middleware.process_response(request, HttpResponse())
+
+    def session(self, refreshed):
+        session = SessionStore()
+        session.update({'theme': 'dark', REFRESHED_KEY: refreshed})
+        session.modified = False
+        return session
+
+    @mock.patch('core.middleware.sessions.time.time', return_value=1030)
+    def test_not_refreshed_within_interval(self, _):
+        """Сессия без изменений не сохраняется раньше интервала."""
+        session = self.session(refreshed=1000)
+        with mock.patch.object(session, 'save') as save:
+            self.process(session)
+        save.assert_not_called()
+
+    @mock.patch('core.middleware.sessions.time.time', return_value=1060)
+    def test_refreshed_after_interval(self, _):
+        """По истечении интервала срок сессии продлевается."""
+        session = self.session(refreshed=1000)
+        with mock.patch.object(session, 'save') as save:
+            self.process(session)
+        save.assert_called_once()
+        self.assertEqual(session[REFRESHED_KEY], 1060)
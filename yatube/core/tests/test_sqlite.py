@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from ..benchmark import sqlite_stress
+
+
+class SQLiteSettingsTests(TestCase):
+    def test_pragmas_applied(self):
+        """PRAGMA из настроек применяются к соединению."""
+        pragmas = settings.SQLITE_TUNED_OPTIONS['pragmas']
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], pragmas['cache_size'])
+
+
+class SQLiteStressTests(SimpleTestCase):
+    def test_parallel_writers_do_not_fail(self):
+        """Параллельные читатели и писатели обходятся без ошибок."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'stress.sqlite3')
+            result = sqlite_stress(path, settings.SQLITE_TUNED_OPTIONS,
+                                   writers=4, readers=4, operations=25)
+            with open(path, 'rb') as file:
+                header = file.read(20)
+        self.assertEqual(result['errors'], 0)
+        self.assertEqual(result['rows'], 100)
+        # Байты 18 и 19 заголовка равны 2 в режиме WAL.
+        self.assertEqual(header[18:20], b'\x02\x02')
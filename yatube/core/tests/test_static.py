@@ -0,0 +1,92 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+import brotli
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from ..middleware.static import accepted_encodings
+
+SOURCE_DIR = tempfile.mkdtemp()
+STATIC_ROOT = tempfile.mkdtemp()
+CSS = b'body { color: black; }\n' * 100
+
+
+@override_settings(
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_DIRS=[SOURCE_DIR],
+    STATICFILES_FINDERS=[
+        'django.contrib.staticfiles.finders.FileSystemFinder',
+    ],
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage',
+)
+class StaticFilesTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(SOURCE_DIR, 'css'))
+        with open(os.path.join(SOURCE_DIR, 'css', 'site.css'), 'wb') as f:
+            f.write(CSS)
+        with open(os.path.join(SOURCE_DIR, 'logo.png'), 'wb') as f:
+            f.write(b'\x89PNG' + bytes(range(256)))
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.css = staticfiles_storage.stored_name('css/site.css')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(SOURCE_DIR, ignore_errors=True)
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+
+    def get(self, name, encoding=''):
+        response = self.client.get(f'/static/{name}',
+                                   HTTP_ACCEPT_ENCODING=encoding)
+        self.addCleanup(response.close)
+        return response
+
+    def test_hashed_names_and_compressed_copies(self):
+        """Текст получает хэш в имени и сжатые копии, картинки — нет."""
+        self.assertRegex(self.css, r'^css/site\.[0-9a-f]{12}\.css$')
+        path = os.path.join(STATIC_ROOT, self.css)
+        with open(path + '.gz', 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), CSS)
+        with open(path + '.br', 'rb') as f:
+            self.assertEqual(brotli.decompress(f.read()), CSS)
+        png = staticfiles_storage.stored_name('logo.png')
+        self.assertFalse(os.path.exists(os.path.join(STATIC_ROOT,
+                                                     png + '.gz')))
+
+    def test_serves_accepted_encoding(self):
+        """Отдаётся сжатая копия, которую принимает клиент."""
+        for header, encoding, decompress in (
+            ('gzip, deflate, br', 'br', brotli.decompress),
+            ('gzip, br;q=0', 'gzip', gzip.decompress),
+            ('', None, bytes),
+        ):
+            with self.subTest(header=header):
+                response = self.get(self.css, header)
+                self.assertEqual(response.get('Content-Encoding'), encoding)
+                self.assertEqual(response['Content-Type'], 'text/css')
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+                body = b''.join(response.streaming_content)
+                self.assertEqual(decompress(body), CSS)
+
+    def test_cache_headers(self):
+        """Файлы с хэшем в имени кэшируются надолго."""
+        self.assertIn('immutable', self.get(self.css)['Cache-Control'])
+        self.assertEqual(self.get('css/site.css')['Cache-Control'],
+                         'public, max-age=60')
+
+    def test_missing_and_outside_files(self):
+        """Чужие и несуществующие пути не отдаются."""
+        for name in ('css/missing.css', '../' + os.path.basename(SOURCE_DIR)):
+            with self.subTest(name=name):
+                self.assertEqual(self.get(name).status_code, 404)
+
+    def test_accepted_encodings(self):
+        """Разбор Accept-Encoding учитывает q=0."""
+        self.assertEqual(accepted_encodings('gzip;q=0.5, BR, identity;q=0'),
+                         {'gzip', 'br'})
@@ -0,0 +1,119 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from posts.models import AuthorStats, Post, User
+
+from ..models import QueuedTask
+from ..tasks import get_backend, task
+
+calls = []
+
+
+@task(backoff=0)
+def record(value):
+    calls.append(value)
+
+
+@task(retries=1, backoff=0)
+def flaky(value):
+    calls.append(value)
+    if calls.count(value) == 1:
+        raise RuntimeError('Первая попытка')
+
+
+@task(retries=1, backoff=60)
+def broken():
+    raise RuntimeError('Всегда')
+
+
+@override_settings(TASKS_EAGER=False,
+                   TASKS_BACKEND='core.tasks.ThreadPoolBackend')
+class ThreadPoolBackendTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_tasks_run_after_commit_in_order(self):
+        """Задачи выполняются после фиксации и в порядке постановки."""
+        with transaction.atomic():
+            for value in range(5):
+                record.delay(value)
+            self.assertEqual(calls, [])
+        get_backend().wait()
+        self.assertEqual(calls, list(range(5)))
+
+    def test_rolled_back_tasks_are_dropped(self):
+        """Задачи из откатившейся транзакции не выполняются."""
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                record.delay('откат')
+                raise RuntimeError
+        get_backend().wait()
+        self.assertEqual(calls, [])
+
+    def test_failed_task_is_retried(self):
+        """Упавшая задача повторяется."""
+        with self.assertLogs('yatube.tasks', 'WARNING'):
+            flaky.delay('повтор')
+            get_backend().wait()
+        self.assertEqual(calls, ['повтор', 'повтор'])
+
+    def test_no_pause_after_last_attempt(self):
+        """После последней попытки задача не ждёт."""
+        with mock.patch('core.tasks.time.sleep') as sleep:
+            with self.assertLogs('yatube.tasks', 'WARNING'):
+                broken.delay()
+                get_backend().wait()
+        sleep.assert_called_once_with(60)
+
+    def test_post_creation_updates_counter_in_background(self):
+        """Счётчик постов автора обновляется фоновой задачей."""
+        user = User.objects.create_user(username='writer')
+        Post.objects.create(text='Тестовый пост', author=user)
+        get_backend().wait()
+        self.assertEqual(AuthorStats.objects.get(user=user).posts_count, 1)
+
+
+@override_settings(TASKS_EAGER=False,
+                   TASKS_BACKEND='core.tasks.DatabaseBackend')
+class DatabaseBackendTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def run_tasks(self):
+        with self.assertLogs('yatube.tasks', 'WARNING'):
+            call_command('run_tasks', '--once', stdout=StringIO())
+
+    def test_worker_runs_queued_tasks(self):
+        """Обработчик выполняет задачи из таблицы и удаляет их."""
+        get_backend().enqueue(record.name, ['первая'])
+        get_backend().enqueue(record.name, ['вторая'])
+        call_command('run_tasks', '--once', stdout=StringIO())
+        self.assertEqual(calls, ['первая', 'вторая'])
+        self.assertFalse(QueuedTask.objects.exists())
+
+    def test_claimed_task_is_not_taken_twice(self):
+        """Забранную задачу другой обработчик не получит до конца аренды."""
+        get_backend().enqueue(record.name, ['одна'])
+        queued = get_backend().claim()
+        self.assertEqual(queued.attempts, 1)
+        self.assertIsNone(get_backend().claim())
+        QueuedTask.objects.update(run_after=queued.run_after.replace(
+            year=2000))
+        self.assertEqual(get_backend().claim().attempts, 2)
+
+    def test_failed_task_is_rescheduled(self):
+        """Упавшая задача остаётся в очереди до исчерпания попыток."""
+        get_backend().enqueue(broken.name, [])
+        self.run_tasks()
+        queued = QueuedTask.objects.get()
+        self.assertEqual(queued.attempts, 1)
+        self.assertFalse(queued.failed)
+        self.assertIn('Всегда', queued.last_error)
+        QueuedTask.objects.update(run_after=queued.run_after.replace(
+            year=2000))
+        self.run_tasks()
+        self.assertTrue(QueuedTask.objects.get().failed)
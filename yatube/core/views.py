@@ -0,0 +1,13 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.shortcuts import render
+
+from .profiling import stats
+
+
+@staff_member_required
+def profiling_stats(request):
+    template = 'core/profiling_stats.html'
+    context = {
+        'views': stats.snapshot(),
+    }
+    return render(request, template, context)
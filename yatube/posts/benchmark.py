@@ -0,0 +1,134 @@
+import datetime
+import random
+import threading
+
+import requests
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+from mixer.backend.django import mixer
+
+from .counters import rebuild_posts_counts
+from .importer import create_posts
+from .models import Group, Post, User
+from .search import rebuild_search_index
+
+WRITER_USERNAME = 'benchmark_writer'
+SEED_BATCH_SIZE = 1000
+
+
+def seed(users, groups, posts, days=365):
+    """Наполняет БД пользователями, группами и постами за days дней."""
+    fake = Faker('ru_RU')
+    now = timezone.now()
+    with transaction.atomic():
+        authors = mixer.cycle(users).blend(
+            User, username=mixer.sequence('benchmark_user_{0}')
+        )
+        authors.append(User.objects.create_user(username=WRITER_USERNAME))
+        group_ids = [group.pk for group in mixer.cycle(groups).blend(
+            Group, slug=mixer.sequence('benchmark-group-{0}')
+        )] + [None]
+        author_ids = [author.pk for author in authors]
+        for start in range(0, posts, SEED_BATCH_SIZE):
+            batch = []
+            for _ in range(min(SEED_BATCH_SIZE, posts - start)):
+                pub_date = now - datetime.timedelta(
+                    seconds=random.randint(0, days * 24 * 60 * 60)
+                )
+                batch.append(Post(
+                    text=fake.paragraph(),
+                    author_id=random.choice(author_ids),
+                    group_id=random.choice(group_ids),
+                    pub_date=pub_date,
+                    updated=pub_date,
+                ))
+            create_posts(batch)
+    rebuild_posts_counts()
+    rebuild_search_index()
+
+
+def build_scenarios():
+    """Сценарии: функции, возвращающие (метод, url, данные формы)."""
+    fake = Faker('ru_RU')
+    writer = User.objects.get(username=WRITER_USERNAME)
+    slugs = list(Group.objects.values_list('slug', flat=True))
+    usernames = list(
+        User.objects.filter(posts__isnull=False).distinct()
+        .values_list('username', flat=True)
+    )
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    own_post = Post.objects.create(text=fake.paragraph(), author=writer)
+    return {
+        'index': lambda: ('get', reverse('posts:index'), None),
+        'index_page_2': lambda: (
+            'get', reverse('posts:index'), {'page': 2}
+        ),
+        'group_list': lambda: ('get', reverse(
+            'posts:group_list', kwargs={'slug': random.choice(slugs)}
+        ), None),
+        'profile': lambda: ('get', reverse(
+            'posts:profile', kwargs={'username': random.choice(usernames)}
+        ), None),
+        'post_detail': lambda: ('get', reverse(
+            'posts:post_detail', kwargs={'post_id': random.choice(post_ids)}
+        ), None),
+        'post_create': lambda: (
+            'post', reverse('posts:post_create'), {'text': fake.paragraph()}
+        ),
+        'post_edit': lambda: ('post', reverse(
+            'posts:post_edit', kwargs={'post_id': own_post.pk}
+        ), {'text': fake.paragraph()}),
+    }, writer
+
+
+class ClientDriver:
+    """Запросы через тестовый клиент Django в том же процессе."""
+
+    def __init__(self, user, **headers):
+        self.client = Client(**headers)
+        self.client.force_login(user)
+
+    def __call__(self, method, url, data):
+        response = getattr(self.client, method)(url, data)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{method.upper()} {url}: '
+                               f'{response.status_code}')
+        return response
+
+
+class HTTPDriver:
+    """Запросы к живому WSGI-серверу, по сессии HTTP на поток."""
+
+    def __init__(self, base_url, user):
+        self.base_url = base_url
+        client = Client()
+        client.force_login(user)
+        self.session_id = client.cookies['sessionid'].value
+        self.local = threading.local()
+
+    def session(self):
+        if not hasattr(self.local, 'session'):
+            session = requests.Session()
+            session.cookies.set('sessionid', self.session_id)
+            session.get(self.base_url + reverse('posts:post_create'))
+            self.local.session = session
+        return self.local.session
+
+    def __call__(self, method, url, data):
+        session = self.session()
+        if method == 'post':
+            data = dict(data,
+                        csrfmiddlewaretoken=session.cookies['csrftoken'])
+        response = session.request(
+            method, self.base_url + url,
+            params=data if method == 'get' else None,
+            data=data if method == 'post' else None,
+            allow_redirects=False,
+        )
+        if response.status_code >= 400:
+            raise RuntimeError(f'{method.upper()} {url}: '
+                               f'{response.status_code}')
+        return response
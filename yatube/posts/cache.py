@@ -0,0 +1,57 @@
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.routers import cache_timeout
+
+FEED_INDEX = 'index'
+FEED_GROUP = 'group'
+FEED_AUTHOR = 'author'
+
+
+def feed_key(feed, pk=None):
+    return feed if pk is None else f'{feed}:{pk}'
+
+
+def get_feed_version(key):
+    cache_key = f'posts:feed_version:{key}'
+    version = cache.get(cache_key)
+    if version is None:
+        # Начальная версия от времени, чтобы после вытеснения ключа
+        # не совпасть со старыми фрагментами.
+        cache.add(cache_key, time.time_ns())
+        version = cache.get(cache_key)
+    return version
+
+
+def get_feed_modified(key):
+    """Время последнего изменения ленты, для Last-Modified."""
+    cache_key = f'posts:feed_modified:{key}'
+    modified = cache.get(cache_key)
+    if modified is None:
+        cache.add(cache_key, time.time())
+        modified = cache.get(cache_key)
+    return datetime.fromtimestamp(modified, tz=timezone.utc)
+
+
+def bump_feed_versions(keys):
+    now = time.time()
+    for key in set(keys):
+        cache_key = f'posts:feed_version:{key}'
+        try:
+            cache.incr(cache_key)
+        except ValueError:
+            cache.add(cache_key, time.time_ns())
+        cache.set(f'posts:feed_modified:{key}', now)
+
+
+def feed_cache_context(request, feed, pk=None):
+    key = feed_key(feed, pk)
+    return {
+        'timeout': cache_timeout(settings.POSTS_FEED_CACHE_TIMEOUT),
+        'key': key,
+        'version': get_feed_version(key),
+        'page': request.GET.urlencode(),
+    }
@@ -0,0 +1,101 @@
+import hashlib
+
+from django.views.decorators.http import condition
+
+from .cache import (FEED_AUTHOR, FEED_GROUP, FEED_INDEX, feed_key,
+                    get_feed_modified, get_feed_version)
+from .models import Group, Post, User
+
+
+def make_etag(request, *parts):
+    parts += (request.user.pk, request.GET.urlencode())
+    raw = '|'.join(str(part) for part in parts)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def anonymous_only(last_modified):
+    # Шапка страницы зависит от пользователя, поэтому авторизованным
+    # отвечаем только по ETag, в который входит id пользователя.
+    def last_modified_func(request, **kwargs):
+        if request.user.is_authenticated:
+            return None
+        return last_modified(request, **kwargs)
+    return last_modified_func
+
+
+def feed_condition(get_feed_key):
+    # Валидаторы лент — версия из кэша, которую сбрасывают сигналы
+    # при изменении постов, групп и авторов: без запросов по ленте.
+    def get_key(request, **kwargs):
+        if not hasattr(request, '_posts_feed_key'):
+            request._posts_feed_key = get_feed_key(**kwargs)
+        return request._posts_feed_key
+
+    def etag(request, **kwargs):
+        key = get_key(request, **kwargs)
+        if key is None:
+            return None
+        return make_etag(request, key, get_feed_version(key))
+
+    def last_modified(request, **kwargs):
+        key = get_key(request, **kwargs)
+        if key is None:
+            return None
+        return get_feed_modified(key)
+
+    return condition(etag_func=etag,
+                     last_modified_func=anonymous_only(last_modified))
+
+
+def index_feed():
+    return feed_key(FEED_INDEX)
+
+
+def group_feed(slug):
+    pk = Group.objects.filter(slug=slug).values_list('pk', flat=True).first()
+    return None if pk is None else feed_key(FEED_GROUP, pk)
+
+
+def author_feed(username):
+    pk = User.objects.filter(
+        username=username
+    ).values_list('pk', flat=True).first()
+    return None if pk is None else feed_key(FEED_AUTHOR, pk)
+
+
+def post_related_feeds(state):
+    # Имя автора, группа и миниатюра меняют версии этих лент.
+    keys = [feed_key(FEED_AUTHOR, state['author_id'])]
+    if state['group_id'] is not None:
+        keys.append(feed_key(FEED_GROUP, state['group_id']))
+    return keys
+
+
+def post_condition():
+    def get_state(request, post_id):
+        if not hasattr(request, '_posts_detail_state'):
+            request._posts_detail_state = Post.objects.filter(
+                pk=post_id
+            ).values('updated', 'author_id', 'group_id',
+                     'author__stats__posts_count').first() or {}
+        return request._posts_detail_state
+
+    def etag(request, post_id):
+        state = get_state(request, post_id)
+        if not state:
+            return None
+        return make_etag(request, state['updated'],
+                         state['author__stats__posts_count'],
+                         *(get_feed_version(key)
+                           for key in post_related_feeds(state)))
+
+    def last_modified(request, post_id):
+        state = get_state(request, post_id)
+        if not state:
+            return None
+        return max(state['updated'], *(
+            get_feed_modified(key) for key in post_related_feeds(state)
+        ))
+
+    return condition(etag_func=etag,
+                     last_modified_func=anonymous_only(last_modified))
@@ -0,0 +1,45 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import AuthorStats, Post
+
+
+def change_posts_count(user_id, delta):
+    updated = AuthorStats.objects.filter(user_id=user_id).update(
+        posts_count=F('posts_count') + delta
+    )
+    if not updated and delta > 0:
+        AuthorStats.objects.get_or_create(
+            user_id=user_id,
+            defaults={
+                'posts_count': Post.objects.filter(author_id=user_id).count()
+            },
+        )
+
+
+def refresh_posts_count(user_id):
+    # Пересчёт, а не приращение: повтор упавшей задачи безопасен.
+    AuthorStats.objects.update_or_create(
+        user_id=user_id,
+        defaults={
+            'posts_count': Post.objects.filter(author_id=user_id).count()
+        },
+    )
+
+
+def get_posts_count(user):
+    try:
+        return user.stats.posts_count
+    except AuthorStats.DoesNotExist:
+        return Post.objects.filter(author_id=user.pk).count()
+
+
+def rebuild_posts_counts():
+    counts = Post.objects.values('author_id').annotate(total=Count('id'))
+    with transaction.atomic():
+        AuthorStats.objects.all().delete()
+        AuthorStats.objects.bulk_create(
+            AuthorStats(user_id=row['author_id'], posts_count=row['total'])
+            for row in counts
+        )
+    return len(counts)
@@ -0,0 +1,72 @@
+import csv
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import Post
+
+EXPORT_FIELDS = ('id', 'text', 'pub_date', 'updated', 'author__username',
+                 'group__slug')
+EXPORT_HEADER = ('id', 'text', 'pub_date', 'updated', 'author', 'group')
+CHUNK_SIZE = 1000
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time()))
+
+
+def export_rows(author=None, group=None, since=None, until=None,
+                chunk_size=CHUNK_SIZE):
+    """Кортежи постов по возрастанию id, кусками по ключу без OFFSET."""
+    posts = Post.objects.all()
+    if author:
+        posts = posts.filter(author__username=author)
+    if group:
+        posts = posts.filter(group__slug=group)
+    if since:
+        posts = posts.filter(pub_date__gte=_start_of(since))
+    if until:
+        posts = posts.filter(
+            pub_date__lt=_start_of(until + datetime.timedelta(days=1))
+        )
+    posts = posts.order_by('pk').values_list(*EXPORT_FIELDS)
+    last_pk = 0
+    while True:
+        rows = 0
+        chunk = posts.filter(pk__gt=last_pk)[:chunk_size]
+        for row in chunk.iterator(chunk_size=chunk_size):
+            rows += 1
+            last_pk = row[0]
+            yield row
+        if rows < chunk_size:
+            return
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_HEADER, row)), cls=DjangoJSONEncoder,
+                         ensure_ascii=False) + '\n'
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for row in rows:
+        yield writer.writerow(
+            value.isoformat() if isinstance(value, datetime.datetime)
+            else value
+            for value in row
+        )
+
+
+EXPORT_FORMATS = {
+    'ndjson': (ndjson_lines, 'application/x-ndjson'),
+    'csv': (csv_lines, 'text/csv'),
+}
@@ -1,12 +1,13 @@
 from django import forms
 
+from .export import EXPORT_FORMATS
 from .models import Post
 
 
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
-        fields = ('text', 'group')
+        fields = ('text', 'group', 'image')
 
     def clean_text(self):
         data = self.cleaned_data['text']
@@ -14,3 +15,14 @@ class PostForm(forms.ModelForm):
         if not data:
             raise forms.ValidationError(error)
         return data
+
+
+class ExportForm(forms.Form):
+    format = forms.ChoiceField(
+        choices=[(name, name) for name in EXPORT_FORMATS],
+        required=False,
+    )
+    author = forms.CharField(required=False)
+    group = forms.CharField(required=False)
+    since = forms.DateField(required=False)
+    until = forms.DateField(required=False)
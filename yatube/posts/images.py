@@ -0,0 +1,73 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+from sorl.thumbnail import base, default
+from sorl.thumbnail.conf import defaults as sorl_defaults
+from sorl.thumbnail.conf import settings as sorl_settings
+from sorl.thumbnail.images import ImageFile
+
+
+def post_image_path(instance, filename):
+    """Имя картинки по её содержимому: одинаковые файлы не дублируются."""
+    digest = hashlib.sha256()
+    for chunk in instance.image.chunks():
+        digest.update(chunk)
+    name = digest.hexdigest()
+    extension = os.path.splitext(filename)[1].lower()
+    return f'posts/{name[:2]}/{name}{extension}'
+
+
+@deconstructible
+class ContentHashedStorage(FileSystemStorage):
+    """Хранилище файлов, чьё имя задано содержимым.
+
+    Файл с таким именем уже лежит в хранилище и совпадает с новым,
+    поэтому повторно он не записывается и не получает суффикс.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is not None and self.exists(name):
+            return name
+        return super().save(name, content, max_length)
+
+
+class ThumbnailBackend(base.ThumbnailBackend):
+    """Миниатюры sorl-thumbnail, которые можно искать без их создания."""
+
+    def thumbnail_options(self, source, options):
+        # Те же умолчания, что в get_thumbnail: от них зависит имя файла.
+        if sorl_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(sorl_settings, attr)
+            if value != getattr(sorl_defaults, attr):
+                options.setdefault(key, value)
+        return options
+
+    def get_cached_thumbnail(self, file_, geometry_string, **options):
+        """Готовая миниатюра из хранилища ключей или None."""
+        source = ImageFile(file_)
+        name = self._get_thumbnail_filename(
+            source, geometry_string, self.thumbnail_options(source, options)
+        )
+        return default.kvstore.get(ImageFile(name, default.storage))
+
+
+def cached_thumbnail(image, size):
+    geometry, options = settings.POSTS_THUMBNAILS[size]
+    return default.backend.get_cached_thumbnail(image, geometry, **options)
+
+
+def make_thumbnails(image):
+    """Создаёт недостающие миниатюры; True, если создана хоть одна."""
+    created = False
+    for size, (geometry, options) in settings.POSTS_THUMBNAILS.items():
+        if cached_thumbnail(image, size) is None:
+            default.backend.get_thumbnail(image, geometry, **options)
+            created = True
+    return created
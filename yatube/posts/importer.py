@@ -0,0 +1,183 @@
+import csv
+import json
+import time
+from collections import Counter
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .cache import (FEED_AUTHOR, FEED_GROUP, FEED_INDEX, bump_feed_versions,
+                    feed_key)
+from .counters import change_posts_count
+from .models import Group, Post, User
+from .search import index_posts
+from .timelines import drop_timelines
+
+BATCH_SIZE = 1000
+
+
+def read_rows(source, input_format):
+    """(номер строки файла, строка); неразобранная строка NDJSON — None."""
+    if input_format == 'csv':
+        reader = csv.DictReader(source)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, None
+
+
+def parse_date(value):
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        return None
+
+
+def check_row(row):
+    """Причина, по которой строку нельзя импортировать, или None."""
+    if not isinstance(row, dict):
+        return 'строка не разобрана'
+    for field in ('text', 'author'):
+        if not isinstance(row.get(field), str) or not row[field].strip():
+            return f'нет поля {field}'
+    for field in ('pub_date', 'updated'):
+        if row.get(field) and parse_date(row[field]) is None:
+            return f'неверная дата в поле {field}'
+    return None
+
+
+class LookupCache:
+    """id авторов и групп по username/slug, недостающие создаются."""
+
+    def __init__(self):
+        self.users = {}
+        self.groups = {}
+
+    def resolve(self, rows):
+        usernames = {row['author'] for row in rows} - self.users.keys()
+        slugs = {row['group'] for row in rows if row.get('group')}
+        slugs -= self.groups.keys()
+        if usernames:
+            self._load(User, 'username', usernames, self.users, lambda name: (
+                User(username=name, password=make_password(None))
+            ))
+        if slugs:
+            self._load(Group, 'slug', slugs, self.groups, lambda slug: (
+                Group(title=slug, slug=slug, description='')
+            ))
+
+    @staticmethod
+    def _load(model, field, values, lookup, build):
+        def fetch():
+            lookup.update(model.objects.filter(
+                **{f'{field}__in': values}
+            ).values_list(field, 'pk'))
+        fetch()
+        missing = values - lookup.keys()
+        if missing:
+            model.objects.bulk_create(build(value) for value in missing)
+            fetch()
+
+
+def build_post(row, lookup, now):
+    pub_date = parse_date(row.get('pub_date') or '') or now
+    return Post(
+        text=row['text'],
+        author_id=lookup.users[row['author']],
+        group_id=lookup.groups.get(row.get('group') or None),
+        pub_date=pub_date,
+        updated=parse_date(row.get('updated') or '') or pub_date,
+    )
+
+
+def last_post_pk():
+    return Post.objects.aggregate(last_pk=Max('pk'))['last_pk'] or 0
+
+
+def create_posts(posts, batch_size=None):
+    """bulk_create, сохраняющий pub_date и updated постов.
+
+    auto_now_add и auto_now при вставке ставят текущее время, поэтому
+    даты возвращаются вторым запросом по id новых строк: они больше
+    прежнего максимума. Вызывать в транзакции; возвращает этот максимум.
+    """
+    dates = [(post.pub_date, post.updated) for post in posts]
+    last_pk = last_post_pk()
+    Post.objects.bulk_create(posts, batch_size=batch_size)
+    pks = Post.objects.filter(pk__gt=last_pk).order_by('pk').values_list(
+        'pk', flat=True)
+    pub_date_field = Post._meta.get_field('pub_date')
+    updated_field = Post._meta.get_field('updated')
+    rows = []
+    for post, pk, (pub_date, updated) in zip(posts, pks, dates):
+        post.pub_date, post.updated = pub_date, updated
+        rows.append((pub_date_field.get_db_prep_value(pub_date, connection),
+                     updated_field.get_db_prep_value(updated, connection),
+                     pk))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'UPDATE {Post._meta.db_table} '
+            f'SET pub_date = %s, updated = %s WHERE id = %s',
+            rows,
+        )
+    return last_pk
+
+
+def import_posts(rows, batch_size=BATCH_SIZE, skip=0, on_batch=None,
+                 on_error=None):
+    """Пишет посты пачками, каждая пачка в своей транзакции.
+
+    rows — пары (номер строки, строка) из read_rows. Строки с ошибками
+    пропускаются, on_error(номер строки, причина) сообщает о каждой.
+    bulk_create не шлёт сигналы, поэтому счётчики авторов и поиск
+    обновляются в транзакции пачки и только для её постов.
+    on_batch(imported, elapsed) вызывается после фиксации каждой пачки,
+    imported учитывает и пропущенные skip строк — это контрольная точка.
+    """
+    rows = islice(rows, skip, None)
+    lookup = LookupCache()
+    imported = skip
+    started = time.monotonic()
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        imported += len(batch)
+        valid = []
+        for number, row in batch:
+            error = check_row(row)
+            if error is None:
+                valid.append(row)
+            elif on_error:
+                on_error(number, error)
+        if valid:
+            now = timezone.now()
+            with transaction.atomic():
+                lookup.resolve(valid)
+                posts = [build_post(row, lookup, now) for row in valid]
+                last_pk = create_posts(posts, batch_size)
+                counts = Counter(post.author_id for post in posts)
+                for author_id, count in counts.items():
+                    change_posts_count(author_id, count)
+                # Новые посты получили id больше прежнего максимума.
+                index_posts(Post.objects.filter(pk__gt=last_pk))
+            feeds = {feed_key(FEED_INDEX)}
+            feeds.update(feed_key(FEED_AUTHOR, author_id)
+                         for author_id in counts)
+            feeds.update(feed_key(FEED_GROUP, post.group_id)
+                         for post in posts if post.group_id)
+            bump_feed_versions(feeds)
+            drop_timelines(feeds)
+        if on_batch:
+            on_batch(imported, time.monotonic() - started)
+    return imported
@@ -0,0 +1,107 @@
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import modify_settings
+
+from core.benchmark import best_time, format_table, run, throwaway_database
+from core.middleware.compression import compress, minify_html
+from posts.benchmark import ClientDriver, build_scenarios, seed
+
+MIDDLEWARE = 'core.middleware.compression.CompressionMiddleware'
+ACCEPT_ENCODING = 'gzip, deflate, br'
+ENCODERS = (
+    ('gzip', 1), ('gzip', 6), ('gzip', 9),
+    ('br', 1), ('br', 4), ('br', 6), ('br', 11),
+)
+
+
+def encoder(encoding, level):
+    return lambda body: compress(minify_html(body), encoding, level)
+
+
+class Command(BaseCommand):
+    help = ('Размер и время страниц posts с минификацией и сжатием '
+            'и без них, чистый выигрыш каждого уровня сжатия')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на каждый сценарий')
+        parser.add_argument('--pages', type=int, default=10,
+                            help='Страниц каждого сценария для замера '
+                                 'сжатия')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Повторов сжатия одной страницы')
+        parser.add_argument('--bandwidth', type=float, default=10,
+                            help='Скорость канала клиента, Мбит/с')
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            seed(options['users'], options['groups'], options['posts'])
+            scenarios, writer = build_scenarios()
+            scenarios = {name: scenario
+                         for name, scenario in scenarios.items()
+                         if scenario()[0] == 'get'}
+            results = {}
+            with modify_settings(MIDDLEWARE={'remove': MIDDLEWARE}):
+                driver = ClientDriver(writer)
+                pages = {
+                    name: [driver(*scenario()).content
+                           for _ in range(options['pages'])]
+                    for name, scenario in scenarios.items()
+                }
+                for name, scenario in scenarios.items():
+                    results[f'off:{name}'] = run(
+                        lambda: driver(*scenario()), options['requests']
+                    )
+            driver = ClientDriver(writer, HTTP_ACCEPT_ENCODING=ACCEPT_ENCODING)
+            for name, scenario in scenarios.items():
+                results[f'on:{name}'] = run(
+                    lambda: driver(*scenario()), options['requests']
+                )
+        self.stdout.write('Время в мс, off — без сжатия, on — с ним')
+        self.stdout.write(format_table(results))
+        self.report_sizes(pages)
+        self.report_encoders(pages, options)
+
+    def report_sizes(self, pages):
+        variants = {'raw': bytes, 'minify': minify_html}
+        for encoding, level in settings.COMPRESSION_LEVELS.items():
+            variants[f'{encoding}:{level}'] = encoder(encoding, level)
+        width = max(len(name) for name in pages)
+        self.stdout.write('\nСредний размер страницы, байт')
+        self.stdout.write(f'{"":{width}} ' + ' '.join(
+            f'{name:>9}' for name in variants
+        ))
+        for name, bodies in pages.items():
+            sizes = (statistics.mean(len(variant(body)) for body in bodies)
+                     for variant in variants.values())
+            self.stdout.write(f'{name:{width}} ' + ' '.join(
+                f'{size:9.0f}' for size in sizes
+            ))
+
+    def report_encoders(self, pages, options):
+        bodies = [body for bodies in pages.values() for body in bodies]
+        raw = statistics.mean(len(body) for body in bodies)
+        self.stdout.write(
+            f'\nВсе страницы; выигрыш — время передачи на '
+            f'{options["bandwidth"]:g} Мбит/с минус время сжатия, мкс'
+        )
+        self.stdout.write(f'{"":8} {"байт":>9} {"доля":>7} '
+                          f'{"CPU, мкс":>9} {"выигрыш":>9}')
+        variants = {'minify': minify_html}
+        for encoding, level in ENCODERS:
+            variants[f'{encoding}:{level}'] = encoder(encoding, level)
+        for name, variant in variants.items():
+            size = statistics.mean(len(variant(body)) for body in bodies)
+            cpu = statistics.mean(
+                best_time(lambda: variant(body), options['repeat'])
+                for body in bodies
+            )
+            # Мбит/с — это бит за микросекунду.
+            gain = (raw - size) * 8 / options['bandwidth'] - cpu
+            self.stdout.write(f'{name:8} {size:9.0f} {size / raw:7.1%} '
+                              f'{cpu:9.1f} {gain:+9.0f}')
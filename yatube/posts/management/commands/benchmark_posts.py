@@ -0,0 +1,101 @@
+import contextlib
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+
+from core.asgi import ASGIHandler
+from core.benchmark import (asgi_server, compare, format_table, load_baseline,
+                            run, run_concurrent, save_baseline,
+                            throwaway_database, with_query_delay, wsgi_server)
+from posts.benchmark import ClientDriver, HTTPDriver, build_scenarios, seed
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный прогон всех страниц posts: p50/p95/p99, '
+            'запросов в секунду и SQL-запросов на запрос')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на каждый сценарий')
+        parser.add_argument(
+            '--mode', choices=('client', 'wsgi', 'asgi', 'both', 'servers'),
+            default='client',
+            help='both — client и wsgi, servers — wsgi и asgi',
+        )
+        parser.add_argument('--concurrency', type=int, default=4,
+                            help='Параллельных клиентов в режимах wsgi/asgi')
+        parser.add_argument('--asgi-threads', type=int, default=None,
+                            help='Размер пула потоков ASGI')
+        parser.add_argument('--db-delay', type=float, default=0,
+                            help='Задержка каждого SQL-запроса в wsgi/asgi, '
+                                 'мс: имитация медленной БД')
+        parser.add_argument('--scenario', action='append',
+                            help='Запустить только указанные сценарии')
+        parser.add_argument('--baseline', help='JSON для сравнения')
+        parser.add_argument('--save-baseline', help='Куда сохранить JSON')
+        parser.add_argument('--threshold', type=float, default=None,
+                            help='Допустимый рост p95 в процентах')
+        parser.add_argument(
+            '--in-place', action='store_true',
+            help='Не создавать временную БД, наполнить текущую',
+        )
+
+    def handle(self, *args, **options):
+        database = (contextlib.nullcontext() if options['in_place']
+                    else throwaway_database())
+        with database:
+            seed(options['users'], options['groups'], options['posts'])
+            scenarios, writer = build_scenarios()
+            if options['scenario']:
+                unknown = set(options['scenario']) - scenarios.keys()
+                if unknown:
+                    raise CommandError(f'Нет сценариев: {unknown}')
+                scenarios = {name: scenarios[name]
+                             for name in options['scenario']}
+            results = {}
+            if options['mode'] in ('client', 'both'):
+                driver = ClientDriver(writer)
+                for name, scenario in scenarios.items():
+                    results[f'client:{name}'] = run(
+                        lambda: driver(*scenario()), options['requests']
+                    )
+            application = get_wsgi_application()
+            if options['db_delay']:
+                application = with_query_delay(application,
+                                               options['db_delay'] / 1000)
+            servers = {}
+            if options['mode'] in ('wsgi', 'both', 'servers'):
+                servers['wsgi'] = wsgi_server(application)
+            if options['mode'] in ('asgi', 'servers'):
+                servers['asgi'] = asgi_server(
+                    ASGIHandler(application, options['asgi_threads'])
+                )
+            for server_name, server in servers.items():
+                with server as base_url:
+                    driver = HTTPDriver(base_url, writer)
+                    for name, scenario in scenarios.items():
+                        results[f'{server_name}:{name}'] = run_concurrent(
+                            lambda: driver(*scenario()),
+                            options['requests'], options['concurrency'],
+                        )
+        self.report(results, options)
+
+    def report(self, results, options):
+        changes = None
+        if options['baseline']:
+            changes = compare(results, load_baseline(options['baseline']))
+        self.stdout.write('Время в мс' + (
+            ', изменение p95 к базовому прогону' if changes else ''
+        ))
+        self.stdout.write(format_table(results, changes))
+        if options['save_baseline']:
+            save_baseline(options['save_baseline'], results)
+        threshold = options['threshold']
+        if changes and threshold is not None:
+            slower = {name: change for name, change in changes.items()
+                      if change > threshold}
+            if slower:
+                raise CommandError(f'p95 вырос больше {threshold}%: {slower}')
@@ -0,0 +1,109 @@
+import itertools
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.benchmark import percentile, throwaway_database
+from posts.benchmark import build_scenarios, seed
+
+PASSWORD = 'benchmark-password'
+WRITES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+def count_queries(queries):
+    """(всего, записей, к таблице сессий) среди SQL-запросов."""
+    sql = [query['sql'].lstrip().upper() for query in queries]
+    return (
+        len(sql),
+        sum(statement.startswith(WRITES) for statement in sql),
+        sum('DJANGO_SESSION' in statement for statement in sql),
+    )
+
+
+def measure(func):
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = func()
+        elapsed = time.perf_counter() - started
+    return response, elapsed, count_queries(queries)
+
+
+class Command(BaseCommand):
+    help = ('Просмотр лент залогиненным пользователем в каждом режиме '
+            'сессий: SQL-запросы и записи в БД на запрос, вход и выход')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов к лентам в каждом режиме')
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            seed(options['users'], options['groups'], options['posts'])
+            scenarios, writer = build_scenarios()
+            writer.set_password(PASSWORD)
+            writer.save()
+            pages = [scenario for scenario in scenarios.values()
+                     if scenario()[0] == 'get']
+            results = {
+                mode: self.browse(engine, writer, pages, options['requests'])
+                for mode, engine in settings.SESSION_ENGINES.items()
+            }
+        self.stdout.write(
+            f'{"":15} {"вход":>5} {"SQL":>6} {"сессия":>7} '
+            f'{"записи":>7} {"выход":>6} {"p50, мс":>8}'
+        )
+        self.stdout.write('SQL, сессия и записи — в среднем на запрос '
+                          'к ленте; вход и выход — записей в БД')
+        for mode, result in results.items():
+            self.stdout.write(
+                f'{mode:15} {result["login"]:5} {result["queries"]:6.2f} '
+                f'{result["session"]:7.2f} {result["writes"]:7.2f} '
+                f'{result["logout"]:6} {result["p50"]:8.2f}'
+            )
+
+    def browse(self, engine, user, pages, requests):
+        with override_settings(SESSION_ENGINE=engine):
+            cache.clear()
+            client = Client()
+            response, _, (_, login_writes, _) = measure(
+                lambda: client.post(reverse('users:login'), {
+                    'username': user.username, 'password': PASSWORD,
+                })
+            )
+            if response.status_code != 302:
+                raise CommandError(f'{engine}: вход не удался')
+            timings = []
+            totals = [0, 0, 0]
+            scenarios = itertools.cycle(pages)
+            for _ in range(requests):
+                _, url, data = next(scenarios)()
+                response, elapsed, counts = measure(
+                    lambda: client.get(url, data)
+                )
+                if response.status_code != 200:
+                    raise CommandError(f'{engine}: GET {url}: '
+                                       f'{response.status_code}')
+                timings.append(elapsed)
+                totals = [total + count
+                          for total, count in zip(totals, counts)]
+            _, _, (_, logout_writes, _) = measure(
+                lambda: client.get(reverse('users:logout'))
+            )
+        queries, writes, session = (total / requests for total in totals)
+        return {
+            'login': login_writes,
+            'queries': queries,
+            'writes': writes,
+            'session': session,
+            'logout': logout_writes,
+            'p50': percentile(timings, 50) * 1000,
+        }
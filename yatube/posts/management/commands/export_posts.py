@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+
+from posts.export import CHUNK_SIZE, EXPORT_FORMATS, export_rows
+
+
+def date_argument(value):
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(value)
+    return day
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты в NDJSON или CSV без загрузки таблицы в память'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS,
+                            default='ndjson')
+        parser.add_argument('--output', help='Файл, по умолчанию stdout')
+        parser.add_argument('--author', help='username автора')
+        parser.add_argument('--group', help='slug группы')
+        parser.add_argument('--since', type=date_argument,
+                            help='С даты, ГГГГ-ММ-ДД')
+        parser.add_argument('--until', type=date_argument,
+                            help='По дату включительно, ГГГГ-ММ-ДД')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        lines, _ = EXPORT_FORMATS[options['format']]
+        rows = export_rows(
+            author=options['author'],
+            group=options['group'],
+            since=options['since'],
+            until=options['until'],
+            chunk_size=options['chunk_size'],
+        )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8',
+                      newline='') as output:
+                output.writelines(lines(rows))
+        else:
+            for line in lines(rows):
+                self.stdout.write(line, ending='')
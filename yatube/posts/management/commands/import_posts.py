@@ -0,0 +1,60 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from posts.importer import BATCH_SIZE, import_posts, read_rows
+
+
+class Command(BaseCommand):
+    help = ('Импортирует посты из NDJSON или CSV пачками через bulk_create, '
+            'создавая недостающих авторов и группы')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл NDJSON или CSV')
+        parser.add_argument('--format', choices=('ndjson', 'csv'),
+                            help='По умолчанию определяется по расширению')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл контрольной точки для продолжения импорта',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['format'] or (
+            'csv' if path.endswith('.csv') else 'ndjson'
+        )
+        checkpoint = options['checkpoint']
+        skip = 0
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as file:
+                skip = int(file.read().strip() or 0)
+            self.stdout.write(f'Продолжаем со строки {skip}')
+
+        skipped = []
+
+        def on_error(number, error):
+            skipped.append(number)
+            self.stderr.write(f'Строка {number} пропущена: {error}')
+
+        def on_batch(imported, elapsed):
+            if checkpoint:
+                with open(checkpoint, 'w') as file:
+                    file.write(str(imported))
+            rate = (imported - skip) / elapsed if elapsed else 0
+            self.stdout.write(
+                f'Импортировано строк: {imported}, {rate:.0f} строк/с'
+            )
+
+        with open(path, encoding='utf-8', newline='') as source:
+            imported = import_posts(
+                read_rows(source, input_format),
+                batch_size=options['batch_size'],
+                skip=skip,
+                on_batch=on_batch,
+                on_error=on_error,
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Импорт завершён, всего строк: {imported}, '
+            f'пропущено: {len(skipped)}'
+        ))
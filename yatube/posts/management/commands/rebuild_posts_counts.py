@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import rebuild_posts_counts
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает количество постов у каждого автора'
+
+    def handle(self, *args, **options):
+        authors = rebuild_posts_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано авторов: {authors}')
+        )
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+FTS_TABLE = 'posts_post_fts'
+TSVECTOR_INDEX = 'posts_post_text_tsv'
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        from posts.stemmer import stem_text
+
+        Post = apps.get_model('posts', 'Post')
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(text)'
+        )
+        for pk, text in Post.objects.values_list('pk', 'text').iterator():
+            schema_editor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, text) VALUES (%s, %s)',
+                [pk, ' '.join(stem_text(text))],
+            )
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX {TSVECTOR_INDEX} ON posts_post USING GIN '
+            f"(to_tsvector('russian'::regconfig, COALESCE(text, '')))"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+    elif connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX {TSVECTOR_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_updated'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from .images import ContentHashedStorage, post_image_path
+
 User = get_user_model()
 
 
@@ -25,6 +27,15 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def for_feed(self):
+        return self.select_related('author', 'group').only(
+            'id', 'text', 'pub_date', 'image',
+            'author__username', 'author__first_name', 'author__last_name',
+            'group__slug', 'group__title',
+        )
+
+
 class Post(models.Model):
     text = models.TextField(
         verbose_name='Текст',
@@ -35,6 +46,10 @@ class Post(models.Model):
         verbose_name='Дата публикации поста',
         help_text='Измените дату публикации поста',
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения поста',
+    )
     author = models.ForeignKey(
         User,
         verbose_name='Автор поста',
@@ -51,6 +66,42 @@ class Post(models.Model):
         on_delete=models.SET_NULL,
         related_name='posts'
     )
+    image = models.ImageField(
+        verbose_name='Картинка',
+        help_text='Загрузите картинку',
+        upload_to=post_image_path,
+        storage=ContentHashedStorage(),
+        blank=True,
+    )
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-pub_date', '-id'],
+                         name='post_feed_idx'),
+            models.Index(fields=['author', '-pub_date', '-id'],
+                         name='post_author_feed_idx'),
+            models.Index(fields=['group', '-pub_date', '-id'],
+                         name='post_group_feed_idx'),
+        ]
 
     def __str__(self):
         return self.text[:15]
+
+
+class AuthorStats(models.Model):
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        verbose_name='Автор',
+        on_delete=models.CASCADE,
+        related_name='stats'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество постов'
+    )
+
+    def __str__(self):
+        return f'{self.user}: {self.posts_count}'
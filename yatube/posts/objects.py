@@ -0,0 +1,84 @@
+import copy
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.routers import primary_reads
+
+from .models import Post, User
+
+# Поля пользователя в кэше: только то, что выводят шаблоны.
+USER_FIELDS = ('id', 'username', 'first_name', 'last_name')
+
+
+def object_key(model, pk):
+    return f'posts:object:{model._meta.label_lower}:{pk}'
+
+
+def cached_fields(model):
+    if model is User:
+        return USER_FIELDS
+    return [field.name for field in model._meta.concrete_fields]
+
+
+def detached(instance):
+    """Копия объекта без подгруженных связей, чтобы они не устаревали."""
+    clone = copy.copy(instance)
+    clone._state = copy.copy(instance._state)
+    clone._state.fields_cache = {}
+    return clone
+
+
+def get_many(model, pks, related=()):
+    """Объекты model по pk: из кэша, промахи одним запросом к БД.
+
+    Объекты связей related (внешние ключи) кэшируются отдельно
+    и подставляются в найденные объекты.
+    """
+    pks = list(dict.fromkeys(pks))
+    keys = {object_key(model, pk): pk for pk in pks}
+    objects = {keys[key]: instance
+               for key, instance in cache.get_many(list(keys)).items()}
+    cached = list(objects.values())
+    missing = [pk for pk in pks if pk not in objects]
+    if missing:
+        fields = list(cached_fields(model))
+        for name in related:
+            related_model = model._meta.get_field(name).related_model
+            fields += [f'{name}__{field}'
+                       for field in cached_fields(related_model)]
+        with primary_reads():
+            loaded = model._default_manager.select_related(*related).only(
+                *fields
+            ).in_bulk(missing)
+        values = {}
+        for instance in loaded.values():
+            values[object_key(model, instance.pk)] = detached(instance)
+            for name in related:
+                value = getattr(instance, name)
+                if value is not None:
+                    values[object_key(type(value), value.pk)] = (
+                        detached(value)
+                    )
+        cache.set_many(values, settings.POSTS_OBJECT_CACHE_TIMEOUT)
+        objects.update(loaded)
+    for name in related:
+        attname = model._meta.get_field(name).attname
+        related_model = model._meta.get_field(name).related_model
+        values = get_many(related_model, (
+            getattr(instance, attname) for instance in cached
+            if getattr(instance, attname) is not None
+        ))
+        for instance in cached:
+            value = values.get(getattr(instance, attname))
+            if value is not None:
+                setattr(instance, name, value)
+    return objects
+
+
+def get_posts(pks):
+    return get_many(Post, pks, related=('author', 'group'))
+
+
+def forget_objects(model, pks):
+    cache.delete_many([object_key(model, pk) for pk in pks])
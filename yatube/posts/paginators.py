@@ -0,0 +1,240 @@
+import base64
+import binascii
+import hashlib
+from math import ceil
+from collections.abc import Sequence
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from core.routers import cache_timeout
+
+FEED_ORDERING = ('-pub_date', '-id')
+# Номера страниц доступны только для начала ленты, дальше навигация
+# идёт по курсору без COUNT(*) и OFFSET.
+MAX_PAGE_NUMBER = 50
+PAGE_WINDOW = 2
+# Начиная с этого количества постов точный COUNT(*) не выполняется.
+APPROXIMATE_COUNT_AFTER = 10000
+COUNT_CACHE_TIMEOUT = 60 * 5
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def encode_cursor(post, direction):
+    raw = f'{direction}|{post.pub_date.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding).decode()
+        direction, pub_date, pk = raw.split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if direction not in (NEXT, PREVIOUS) or pub_date is None:
+        return None
+    return direction, pub_date, pk
+
+
+class CursorPage(Sequence):
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Cursor page of %s>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return encode_cursor(self.object_list[-1], NEXT)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return encode_cursor(self.object_list[0], PREVIOUS)
+
+
+class CursorPaginator:
+    """Пагинация по ключу (pub_date, id) без COUNT(*) и OFFSET."""
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list.order_by(*FEED_ORDERING)
+        self.per_page = int(per_page)
+
+    def get_page(self, cursor):
+        decoded = decode_cursor(cursor) if cursor else None
+        if decoded is None:
+            posts = list(self.object_list[:self.per_page + 1])
+            return self._page(posts, has_previous=False)
+        direction, pub_date, pk = decoded
+        if direction == NEXT:
+            posts = list(
+                self.object_list.filter(
+                    Q(pub_date__lt=pub_date)
+                    | Q(pub_date=pub_date, pk__lt=pk)
+                )[:self.per_page + 1]
+            )
+            return self._page(posts, has_previous=True)
+        posts = list(
+            self.object_list.filter(
+                Q(pub_date__gt=pub_date)
+                | Q(pub_date=pub_date, pk__gt=pk)
+            ).reverse()[:self.per_page + 1]
+        )
+        has_previous = len(posts) > self.per_page
+        posts = posts[:self.per_page]
+        posts.reverse()
+        return CursorPage(posts, self, has_next=True,
+                          has_previous=has_previous)
+
+    def _page(self, posts, has_previous):
+        has_next = len(posts) > self.per_page
+        return CursorPage(posts[:self.per_page], self, has_next=has_next,
+                          has_previous=has_previous)
+
+
+class FeedPage(Page):
+    is_cursor = False
+
+    def has_next(self):
+        if self.paginator.cursor_pages:
+            return self.number < self.paginator.total_pages
+        return super().has_next()
+
+    @property
+    def page_window(self):
+        """Номера страниц для ссылок: первая, последняя и соседи текущей.
+
+        None отмечает пропуск между ними.
+        """
+        last = self.paginator.num_pages
+        numbers = {1, last} | set(range(max(self.number - PAGE_WINDOW, 1),
+                                        min(self.number + PAGE_WINDOW,
+                                            last) + 1))
+        window = []
+        previous = 0
+        for number in sorted(numbers):
+            if number - previous > 1:
+                window.append(None)
+            window.append(number)
+            previous = number
+        return window
+
+    @property
+    def next_is_numbered(self):
+        return self.number < self.paginator.num_pages
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return encode_cursor(self[-1], NEXT)
+
+
+class FeedPaginator(Paginator):
+    """Постраничный вывод для больших лент.
+
+    Выше approximate_after постов количество берётся из оценки
+    планировщика или из кэша, номера страниц ограничены max_pages,
+    дальше лента листается по курсору.
+    """
+
+    def __init__(self, *args, cursor_pages=True, max_pages=MAX_PAGE_NUMBER,
+                 approximate_after=APPROXIMATE_COUNT_AFTER, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_pages = cursor_pages
+        self.max_pages = max_pages
+        self.approximate_after = approximate_after
+        self.count_is_approximate = False
+
+    @cached_property
+    def count(self):
+        # Ленты из хранилища (TimelineFeed) считаются по своему queryset.
+        queryset = getattr(self.object_list, 'queryset', self.object_list)
+        key = count_cache_key(queryset)
+        if key is None:
+            return super().count
+        count = cache.get(key)
+        if count is None:
+            count = estimate_count(queryset)
+            if count is None or count < self.approximate_after:
+                count = super().count
+            if count >= self.approximate_after:
+                cache.set(key, count, cache_timeout(COUNT_CACHE_TIMEOUT))
+        self.count_is_approximate = count >= self.approximate_after
+        return count
+
+    @cached_property
+    def total_pages(self):
+        # super().num_pages записал бы результат в кэш num_pages.
+        if self.count == 0 and not self.allow_empty_first_page:
+            return 0
+        hits = max(1, self.count - self.orphans)
+        return ceil(hits / self.per_page)
+
+    @cached_property
+    def num_pages(self):
+        return min(self.total_pages, self.max_pages)
+
+    @property
+    def is_capped(self):
+        return self.total_pages > self.max_pages
+
+    def _get_page(self, *args, **kwargs):
+        return FeedPage(*args, **kwargs)
+
+
+def count_cache_key(object_list):
+    query = getattr(object_list, 'query', None)
+    if query is None:
+        return None
+    try:
+        sql = str(query)
+    except EmptyResultSet:
+        return None
+    digest = hashlib.md5(sql.encode()).hexdigest()
+    return f'posts:count:{digest}'
+
+
+def estimate_count(queryset):
+    """Оценка числа строк по плану запроса, если СУБД её даёт."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
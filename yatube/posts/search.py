@@ -0,0 +1,115 @@
+from itertools import islice
+
+from django.db import connection, transaction
+
+from .models import Post
+from .stemmer import stem_text
+
+FTS_TABLE = 'posts_post_fts'
+INDEX_BATCH_SIZE = 1000
+
+
+def uses_fts5():
+    return connection.vendor == 'sqlite'
+
+
+def uses_tsvector():
+    return connection.vendor == 'postgresql'
+
+
+def index_post(post):
+    if not uses_fts5():
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                       [post.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, text) VALUES (%s, %s)',
+            [post.pk, ' '.join(stem_text(post.text))],
+        )
+
+
+def unindex_post(post_id):
+    if not uses_fts5():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                       [post_id])
+
+
+def index_posts(posts, batch_size=INDEX_BATCH_SIZE):
+    """Добавляет в индекс посты queryset, которых там ещё нет."""
+    if not uses_fts5():
+        return 0
+    rows = 0
+    posts = posts.values_list('pk', 'text').order_by('pk').iterator()
+    with connection.cursor() as cursor:
+        while True:
+            batch = [(pk, ' '.join(stem_text(text)))
+                     for pk, text in islice(posts, batch_size)]
+            if not batch:
+                break
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, text) VALUES (%s, %s)',
+                batch,
+            )
+            rows += len(batch)
+    return rows
+
+
+def rebuild_search_index(batch_size=INDEX_BATCH_SIZE):
+    if not uses_fts5():
+        return 0
+    # Одной транзакцией: до фиксации поиск видит прежний индекс.
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        return index_posts(Post.objects.all(), batch_size)
+
+
+class FTSResults:
+    """Результаты поиска FTS5 в порядке релевантности для Paginator."""
+
+    def __init__(self, match):
+        self.match = match
+
+    def count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s',
+                [self.match],
+            )
+            return cursor.fetchone()[0]
+
+    def __getitem__(self, page):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s ORDER BY rank '
+                f'LIMIT %s OFFSET %s',
+                [self.match, page.stop - page.start, page.start],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = Post.objects.for_feed().in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
+
+
+def search_posts(query):
+    words = stem_text(query)
+    if not words:
+        return Post.objects.none()
+    if uses_fts5():
+        return FTSResults(' '.join(f'"{word}"*' for word in words))
+    if uses_tsvector():
+        from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                    SearchVector)
+        vector = SearchVector('text', config='russian')
+        search_query = SearchQuery(query, config='russian')
+        return Post.objects.for_feed().annotate(
+            search=vector, rank=SearchRank(vector, search_query)
+        ).filter(search=search_query).order_by('-rank', '-pub_date')
+    posts = Post.objects.for_feed().order_by('-pub_date')
+    for word in words:
+        posts = posts.filter(text__icontains=word)
+    return posts
@@ -0,0 +1,151 @@
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from .cache import (FEED_AUTHOR, FEED_GROUP, FEED_INDEX, bump_feed_versions,
+                    feed_key)
+from .models import Group, Post, User
+from .objects import USER_FIELDS, forget_objects
+from .tasks import (make_post_thumbnails, push_to_post_timelines,
+                    remove_from_post_timelines, remove_from_search_index,
+                    update_posts_count, update_search_index)
+from .timelines import drop_timelines
+
+
+def post_feed_keys(author_id, group_id):
+    keys = [feed_key(FEED_INDEX), feed_key(FEED_AUTHOR, author_id)]
+    if group_id is not None:
+        keys.append(feed_key(FEED_GROUP, group_id))
+    return keys
+
+
+@receiver(post_init, sender=Post)
+def remember_post_relations(sender, instance, **kwargs):
+    instance._saved_author_id = instance.__dict__.get('author_id')
+    instance._saved_group_id = instance.__dict__.get('group_id')
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw=False, **kwargs):
+    old_author_id = instance._saved_author_id
+    if raw:
+        return
+    if created:
+        update_posts_count.delay(instance.author_id)
+    elif old_author_id not in (None, instance.author_id):
+        update_posts_count.delay(old_author_id)
+        update_posts_count.delay(instance.author_id)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post_feeds(sender, instance, **kwargs):
+    keys = post_feed_keys(instance.author_id, instance.group_id)
+    if instance._saved_author_id is not None:
+        keys += post_feed_keys(instance._saved_author_id,
+                               instance._saved_group_id)
+    bump_feed_versions(keys)
+
+
+@receiver(post_save, sender=Post)
+def push_saved_post(sender, instance, raw=False, **kwargs):
+    old_keys = []
+    if instance._saved_author_id is not None:
+        old_keys = post_feed_keys(instance._saved_author_id,
+                                  instance._saved_group_id)
+    push_to_post_timelines.delay(
+        instance.pk, post_feed_keys(instance.author_id, instance.group_id),
+        old_keys,
+    )
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    update_posts_count.delay(instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_feeds(sender, instance, **kwargs):
+    bump_feed_versions(post_feed_keys(instance.author_id, instance.group_id))
+
+
+@receiver(post_delete, sender=Post)
+def remove_deleted_post(sender, instance, **kwargs):
+    remove_from_post_timelines.delay(
+        instance.pk, post_feed_keys(instance.author_id, instance.group_id)
+    )
+
+
+def group_feed_keys(group):
+    authors = group.posts.values_list('author_id', flat=True).distinct()
+    return [
+        feed_key(FEED_INDEX),
+        feed_key(FEED_GROUP, group.pk),
+        *(feed_key(FEED_AUTHOR, author_id) for author_id in authors),
+    ]
+
+
+@receiver(post_save, sender=Group)
+def invalidate_saved_group_feeds(sender, instance, created, **kwargs):
+    if not created:
+        bump_feed_versions(group_feed_keys(instance))
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_deleted_group_feeds(sender, instance, **kwargs):
+    bump_feed_versions(group_feed_keys(instance))
+    drop_timelines([feed_key(FEED_GROUP, instance.pk)])
+    # Посты группы отвяжутся от неё через UPDATE, без сигналов.
+    forget_objects(Post, instance.posts.values_list('pk', flat=True))
+
+
+def author_feed_keys(user):
+    groups = list(user.posts.values_list('group_id', flat=True).distinct())
+    keys = [feed_key(FEED_AUTHOR, user.pk)]
+    if groups:
+        keys.append(feed_key(FEED_INDEX))
+    keys += [feed_key(FEED_GROUP, pk) for pk in groups if pk is not None]
+    return keys
+
+
+@receiver(post_save, sender=User)
+def invalidate_saved_author_feeds(sender, instance, created,
+                                  update_fields=None, **kwargs):
+    # Вход сохраняет только last_login, в лентах его нет.
+    if created or (update_fields is not None
+                   and not set(update_fields) & set(USER_FIELDS)):
+        return
+    bump_feed_versions(author_feed_keys(instance))
+
+
+@receiver([post_save, post_delete], sender=Post)
+@receiver([post_save, post_delete], sender=Group)
+@receiver([post_save, post_delete], sender=User)
+def forget_cached_object(sender, instance, **kwargs):
+    forget_objects(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_search_index.delay(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    remove_from_search_index.delay(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def make_saved_post_thumbnails(sender, instance, raw=False, **kwargs):
+    if instance.image and not raw:
+        make_post_thumbnails.delay(
+            instance.pk,
+            post_feed_keys(instance.author_id, instance.group_id),
+        )
+
+
+@receiver(post_save, sender=Post)
+def forget_saved_relations(sender, instance, **kwargs):
+    # Последний обработчик: предыдущие сравнивают старые связи с новыми.
+    instance._saved_author_id = instance.author_id
+    instance._saved_group_id = instance.group_id
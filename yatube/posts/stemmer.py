@@ -0,0 +1,100 @@
+"""Стеммер русского языка по алгоритму Snowball (Russian stemming)."""
+import re
+
+VOWELS = 'аеиоуыэюя'
+
+PERFECTIVE_GERUND = (
+    ('в', 'вши', 'вшись'),
+    ('ив', 'ивши', 'ившись', 'ыв', 'ывши', 'ывшись'),
+)
+ADJECTIVE = (
+    (),
+    ('ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем',
+     'им', 'ым', 'ом', 'его', 'ого', 'ему', 'ому', 'их', 'ых', 'ую', 'юю',
+     'ая', 'яя', 'ою', 'ею'),
+)
+PARTICIPLE = (
+    ('ем', 'нн', 'вш', 'ющ', 'щ'),
+    ('ивш', 'ывш', 'ующ'),
+)
+REFLEXIVE = ((), ('ся', 'сь'))
+VERB = (
+    ('ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет',
+     'ют', 'ны', 'ть', 'ешь', 'нно'),
+    ('ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй',
+     'ил', 'ыл', 'им', 'ым', 'ен', 'ило', 'ыло', 'ено', 'ят', 'ует', 'уют',
+     'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю'),
+)
+NOUN = (
+    (),
+    ('а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и',
+     'ией', 'ей', 'ой', 'ий', 'й', 'иям', 'ям', 'ием', 'ем', 'ам', 'ом', 'о',
+     'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ю', 'ия', 'ья', 'я'),
+)
+SUPERLATIVE = ((), ('ейш', 'ейше'))
+DERIVATIONAL = ((), ('ост', 'ость'))
+
+WORD_RE = re.compile(r'\w+')
+
+
+def _region(word, start):
+    for i in range(start + 1, len(word)):
+        if word[i] not in VOWELS and word[i - 1] in VOWELS:
+            return i + 1
+    return len(word)
+
+
+def _ending(word, start, groups):
+    """Самое длинное окончание из групп, целиком лежащее в регионе.
+
+    Окончания первой группы должны идти после «а» или «я».
+    """
+    best, best_group = '', None
+    for group, endings in enumerate(groups):
+        for ending in endings:
+            if len(ending) > len(best) and word.endswith(ending):
+                best, best_group = ending, group
+    if not best or len(word) - len(best) < start:
+        return ''
+    if best_group == 0:
+        position = len(word) - len(best) - 1
+        if position < start or word[position] not in 'ая':
+            return ''
+    return best
+
+
+def _remove(word, start, groups):
+    ending = _ending(word, start, groups)
+    return (word[:-len(ending)], True) if ending else (word, False)
+
+
+def stem(word):
+    word = word.lower().replace('ё', 'е')
+    rv = next((i + 1 for i, char in enumerate(word) if char in VOWELS),
+              len(word))
+    r2 = _region(word, _region(word, 0))
+
+    word, removed = _remove(word, rv, PERFECTIVE_GERUND)
+    if not removed:
+        word, _ = _remove(word, rv, REFLEXIVE)
+        word, removed = _remove(word, rv, ADJECTIVE)
+        if removed:
+            word, _ = _remove(word, rv, PARTICIPLE)
+        else:
+            word, removed = _remove(word, rv, VERB)
+            if not removed:
+                word, _ = _remove(word, rv, NOUN)
+
+    word, _ = _remove(word, rv, ((), ('и',)))
+    word, _ = _remove(word, r2, DERIVATIONAL)
+
+    word, removed = _remove(word, rv, SUPERLATIVE)
+    if word.endswith('нн') and len(word) - 2 >= rv:
+        word = word[:-1]
+    elif not removed:
+        word, _ = _remove(word, rv, ((), ('ь',)))
+    return word
+
+
+def stem_text(text):
+    return [stem(word) for word in WORD_RE.findall(text)]
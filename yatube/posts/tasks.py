@@ -0,0 +1,51 @@
+from core.tasks import task
+
+from .cache import FEED_AUTHOR, bump_feed_versions, feed_key
+from .counters import refresh_posts_count
+from .images import make_thumbnails
+from .models import Post
+from .search import index_post, unindex_post
+from .timelines import push_to_timelines, remove_from_timelines
+
+
+@task()
+def update_posts_count(user_id):
+    refresh_posts_count(user_id)
+    # Счётчик выводится в профиле, а задача могла выполниться
+    # позже сброса версий в сигнале.
+    bump_feed_versions([feed_key(FEED_AUTHOR, user_id)])
+
+
+@task()
+def push_to_post_timelines(post_id, keys, old_keys=()):
+    remove_from_timelines(set(old_keys) - set(keys), post_id)
+    post = Post.objects.filter(pk=post_id).only('pk', 'pub_date').first()
+    if post is not None:
+        push_to_timelines(keys, post)
+
+
+@task()
+def remove_from_post_timelines(post_id, keys):
+    remove_from_timelines(keys, post_id)
+
+
+@task()
+def update_search_index(post_id):
+    post = Post.objects.filter(pk=post_id).only('pk', 'text').first()
+    if post is None:
+        unindex_post(post_id)
+    else:
+        index_post(post)
+
+
+@task()
+def remove_from_search_index(post_id):
+    unindex_post(post_id)
+
+
+@task()
+def make_post_thumbnails(post_id, keys):
+    post = Post.objects.filter(pk=post_id).only('pk', 'image').first()
+    if post is not None and post.image and make_thumbnails(post.image):
+        # Ленты в кэше отрисованы с исходной картинкой.
+        bump_feed_versions(keys)
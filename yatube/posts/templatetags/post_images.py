@@ -0,0 +1,14 @@
+from django import template
+
+from ..images import cached_thumbnail
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_thumbnail(image, size):
+    """Готовая миниатюра, а пока её нет — исходная картинка.
+
+    Картинка здесь не обрабатывается: миниатюры создаёт фоновая задача.
+    """
+    return cached_thumbnail(image, size) or image
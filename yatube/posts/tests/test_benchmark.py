@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from core.benchmark import compare, percentile, summarize
+
+
+class BenchmarkTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.baseline = os.path.join(self.tmp_dir.name, 'baseline.json')
+
+    def benchmark(self, *args):
+        out = StringIO()
+        call_command('benchmark_posts', '--in-place', '--users', '3',
+                     '--groups', '2', '--posts', '30', '--requests', '3',
+                     *args, stdout=out)
+        return out.getvalue()
+
+    def test_summary_percentiles(self):
+        """Перцентили и ошибки считаются по замерам."""
+        samples = [(i / 1000, 2) for i in range(1, 101)] + [(None, None)]
+        summary = summarize(samples, elapsed=1)
+        self.assertEqual(percentile([3, 1, 2], 50), 2)
+        self.assertEqual(summary['p95'], 95)
+        self.assertEqual(summary['p99'], 99)
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['queries'], 2)
+
+    def test_command_reports_all_scenarios(self):
+        """Прогон проходит по всем страницам posts и сохраняет базу."""
+        output = self.benchmark('--save-baseline', self.baseline)
+        with open(self.baseline) as file:
+            results = json.load(file)
+        for name in ('index', 'group_list', 'profile', 'post_detail',
+                     'post_create', 'post_edit'):
+            with self.subTest(name=name):
+                self.assertIn(f'client:{name}', output)
+                self.assertEqual(results[f'client:{name}']['errors'], 0)
+
+    def test_threshold_fails_on_regression(self):
+        """Рост p95 выше порога относительно базы — ошибка."""
+        results = {'client:index': {'p95': 0.001}}
+        with open(self.baseline, 'w') as file:
+            json.dump(results, file)
+        self.assertEqual(
+            compare({'client:index': {'p95': 0.002}}, results),
+            {'client:index': 100.0},
+        )
+        with self.assertRaises(CommandError):
+            self.benchmark('--scenario', 'index', '--baseline',
+                           self.baseline, '--threshold', '10')
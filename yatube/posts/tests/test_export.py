@@ -0,0 +1,95 @@
+import csv
+import datetime
+import json
+from http import HTTPStatus
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..export import export_rows
+from ..models import Group, Post, User
+
+
+class PostExportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='exporter')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Экспорт',
+            slug='export_slug',
+            description='Тестовое описание',
+        )
+        for i in range(5):
+            Post.objects.create(
+                text=f'Пост {i}',
+                author=cls.user,
+                group=cls.group if i % 2 else None,
+            )
+        Post.objects.create(text='Чужой пост', author=cls.other)
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_rows_cover_all_chunks(self):
+        """Выгрузка кусками отдаёт каждый пост ровно один раз."""
+        ids = [row[0] for row in export_rows(chunk_size=2)]
+        self.assertEqual(
+            ids, list(Post.objects.order_by('pk').values_list('pk',
+                                                              flat=True)))
+
+    def test_rows_filters(self):
+        """Фильтры по автору, группе и датам."""
+        today = timezone.localdate()
+        filters = (
+            ({'author': 'exporter'}, 5),
+            ({'group': 'export_slug'}, 2),
+            ({'author': 'other', 'since': today}, 1),
+            ({'until': today - datetime.timedelta(days=1)}, 0),
+        )
+        for params, expected in filters:
+            with self.subTest(params=params):
+                self.assertEqual(len(list(export_rows(**params))), expected)
+
+    def test_export_view_streams_ndjson(self):
+        """Страница выгрузки отдаёт NDJSON потоком."""
+        response = self.authorized_client.get(
+            reverse('posts:export'), {'group': 'export_slug'})
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in
+                b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['group'] for row in rows],
+                         ['export_slug', 'export_slug'])
+
+    def test_export_view_csv(self):
+        """Выгрузка в CSV с заголовком."""
+        response = self.authorized_client.get(
+            reverse('posts:export'), {'format': 'csv'})
+        rows = list(csv.reader(
+            b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0][0], 'id')
+        self.assertEqual(len(rows), Post.objects.count() + 1)
+
+    def test_export_view_requires_login(self):
+        """Гостя перенаправляет на страницу входа."""
+        response = self.guest_client.get(reverse('posts:export'))
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_export_view_rejects_bad_filters(self):
+        """Некорректная дата — ошибка 400."""
+        response = self.authorized_client.get(
+            reverse('posts:export'), {'since': 'вчера'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_export_command(self):
+        """Команда export_posts пишет NDJSON в stdout."""
+        out = StringIO()
+        call_command('export_posts', '--author', 'other', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row['text'] for row in rows], ['Чужой пост'])
@@ -0,0 +1,90 @@
+import hashlib
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..images import cached_thumbnail
+from ..models import Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+def uploaded(name='small.gif'):
+    return SimpleUploadedFile(name, SMALL_GIF, content_type='image/gif')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, TASKS_EAGER=True)
+class PostImageTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='painter')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_create_post_with_image(self):
+        """Картинка из формы сохраняется под именем по содержимому."""
+        self.authorized_client.post(reverse('posts:post_create'), {
+            'text': 'Пост с картинкой', 'image': uploaded(),
+        })
+        post = Post.objects.get(text='Пост с картинкой')
+        digest = hashlib.sha256(SMALL_GIF).hexdigest()
+        self.assertEqual(post.image.name, f'posts/{digest[:2]}/{digest}.gif')
+
+    def test_same_image_is_stored_once(self):
+        """Одинаковые картинки не дублируются в хранилище."""
+        first = Post.objects.create(text='Первый', author=self.user,
+                                    image=uploaded('first.gif'))
+        second = Post.objects.create(text='Второй', author=self.user,
+                                     image=uploaded('second.GIF'))
+        self.assertEqual(first.image.name, second.image.name)
+
+    def test_thumbnails_made_on_save(self):
+        """Миниатюры всех размеров создаются при сохранении поста."""
+        post = Post.objects.create(text='Пост', author=self.user,
+                                   image=uploaded())
+        for size in ('feed', 'detail'):
+            with self.subTest(size=size):
+                thumbnail = cached_thumbnail(post.image, size)
+                self.assertIsNotNone(thumbnail)
+                self.assertTrue(thumbnail.exists())
+        self.assertEqual(cached_thumbnail(post.image, 'feed').x, 960)
+
+    def test_feed_shows_thumbnail(self):
+        """Лента показывает готовую миниатюру."""
+        post = Post.objects.create(text='Пост', author=self.user,
+                                   image=uploaded())
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response,
+                            cached_thumbnail(post.image, 'feed').url)
+
+    def test_feed_never_makes_thumbnails(self):
+        """Без миниатюры лента отдаёт исходную картинку и не ждёт её."""
+        post = Post.objects.create(text='Пост', author=self.user)
+        Post.objects.filter(pk=post.pk).update(image='posts/missing.gif')
+        post.refresh_from_db()
+        cache.clear()
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, post.image.url)
+        self.assertIsNone(cached_thumbnail(post.image, 'feed'))
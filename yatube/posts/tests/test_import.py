@@ -0,0 +1,106 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ..models import Group, Post, User
+from ..search import search_posts
+
+
+@override_settings(TASKS_EAGER=True)
+class PostImportTests(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        return path
+
+    def test_import_ndjson_creates_users_and_groups(self):
+        """Импорт создаёт недостающих авторов и группы, сохраняет даты."""
+        rows = [
+            {'text': f'Пост {i}', 'author': f'user{i % 2}',
+             'group': 'imported' if i % 2 else '',
+             'pub_date': f'2020-01-0{i + 1}T10:00:00+00:00'}
+            for i in range(5)
+        ]
+        path = self.write(
+            'posts.ndjson', '\n'.join(json.dumps(row) for row in rows))
+        call_command('import_posts', path, '--batch-size', '2',
+                     stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 5)
+        self.assertEqual(Group.objects.get(slug='imported').posts.count(), 2)
+        post = Post.objects.get(text='Пост 0')
+        self.assertEqual(post.pub_date.year, 2020)
+        self.assertEqual(post.author.username, 'user0')
+        self.assertEqual(post.author.stats.posts_count, 3)
+
+    def test_import_updates_only_imported_posts(self):
+        """Импорт добавляет к счётчикам и поиску только свои посты."""
+        author = User.objects.create_user(username='existing')
+        Post.objects.create(text='Старый пост про дождь', author=author)
+        rows = [{'text': f'Импорт про дождь {i}', 'author': 'existing'}
+                for i in range(3)]
+        path = self.write(
+            'posts.ndjson', '\n'.join(json.dumps(row) for row in rows))
+        call_command('import_posts', path, '--batch-size', '2',
+                     stdout=StringIO())
+        author.stats.refresh_from_db()
+        self.assertEqual(author.stats.posts_count, 4)
+        self.assertEqual(len(list(search_posts('дождь')[0:10])), 4)
+        post = Post.objects.get(text='Импорт про дождь 0')
+        self.assertEqual(post.updated, post.pub_date)
+
+    def test_import_csv_resumes_from_checkpoint(self):
+        """Импорт продолжается с контрольной точки."""
+        author = User.objects.create_user(username='csv_author')
+        path = self.write('posts.csv', 'text,author,group\n' + ''.join(
+            f'Пост {i},{author.username},\n' for i in range(4)
+        ))
+        checkpoint = self.write('checkpoint', '3')
+        call_command('import_posts', path, '--checkpoint', checkpoint,
+                     stdout=StringIO())
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['Пост 3'])
+        with open(checkpoint) as file:
+            self.assertEqual(file.read(), '4')
+
+    def test_export_import_round_trip(self):
+        """Выгрузка загружается обратно без потерь."""
+        user = User.objects.create_user(username='round_trip')
+        Post.objects.create(text='Пост, с "кавычками"', author=user)
+        out = StringIO()
+        call_command('export_posts', '--format', 'csv', stdout=out)
+        Post.objects.all().delete()
+        path = self.write('posts.csv', out.getvalue())
+        call_command('import_posts', path, stdout=StringIO())
+        self.assertEqual(Post.objects.get().text, 'Пост, с "кавычками"')
+
+    def test_bad_rows_reported_and_skipped(self):
+        """Строки с ошибками пропускаются с номером строки в отчёте."""
+        lines = [
+            json.dumps({'text': 'Хороший пост', 'author': 'good'}),
+            '{"text": ',
+            json.dumps({'text': 'Без автора'}),
+            '',
+            json.dumps({'text': 'Пост', 'author': 'good',
+                        'pub_date': '2020-13-45T10:00:00'}),
+            json.dumps({'text': 'Ещё пост', 'author': 'good'}),
+        ]
+        path = self.write('posts.ndjson', '\n'.join(lines))
+        out, err = StringIO(), StringIO()
+        call_command('import_posts', path, stdout=out, stderr=err)
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            ['Ещё пост', 'Хороший пост'])
+        report = err.getvalue()
+        for number in (2, 3, 5):
+            with self.subTest(number=number):
+                self.assertIn(f'Строка {number} пропущена', report)
+        self.assertIn('пропущено: 3', out.getvalue())
@@ -1,6 +1,18 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock, skipUnless
 
-from ..models import Group, Post, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..counters import get_posts_count
+from ..models import AuthorStats, Group, Post, User
+from ..tasks import update_posts_count
+from ..timelines import get_store
+from ..utils import POSTS_PER_PAGE
 
 
 class PostModelTest(TestCase):
@@ -88,3 +100,116 @@ class PostModelTest(TestCase):
             with self.subTest(field=field):
                 self.assertEqual(
                     group._meta.get_field(field).help_text, expected_value)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN из SQLite')
+class PostFeedIndexTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='test_user')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test_slug',
+            description='Тестовое описание',
+        )
+        for i in range(POSTS_PER_PAGE + 5):
+            Post.objects.create(
+                text=f'Пост {i}', author=cls.user, group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return ' '.join(str(row[-1]) for row in cursor.fetchall())
+
+    def feed_queries(self, url):
+        """SQL лент, которые выполняет представление на разных страницах.
+
+        Короткое хранилище лент заставляет первую страницу читаться
+        из for_feed() с select_related и only, как за пределами ленты.
+        """
+        requests = [{}, {'page': 2}, {'cursor': ''}]
+        with CaptureQueriesContext(connection) as queries:
+            for data in requests:
+                self.guest_client.get(url, data)
+            response = self.guest_client.get(url, {'cursor': ''})
+            self.guest_client.get(
+                url, {'cursor': response.context['page_obj'].next_cursor})
+            with mock.patch.object(get_store(), 'length', 1):
+                cache.clear()
+                self.guest_client.get(url)
+        return [query['sql'] for query in queries.captured_queries
+                if 'FROM "posts_post"' in query['sql']
+                and 'ORDER BY' in query['sql']]
+
+    def test_feed_queries_use_index_without_sort(self):
+        """Ленты читаются по индексу без сортировки во временном B-дереве"""
+        feeds = {
+            'post_feed_idx': reverse('posts:index'),
+            'post_group_feed_idx': reverse(
+                'posts:group_list', kwargs={'slug': self.group.slug}),
+            'post_author_feed_idx': reverse(
+                'posts:profile', kwargs={'username': self.user.username}),
+        }
+        for index, url in feeds.items():
+            sql = self.feed_queries(url)
+            self.assertTrue(any('INNER JOIN' in query for query in sql))
+            for query in sql:
+                with self.subTest(index=index, query=query):
+                    plan = self.explain(query)
+                    self.assertIn(index, plan)
+                    self.assertNotIn('TEMP B-TREE', plan)
+
+
+@override_settings(TASKS_EAGER=True)
+class AuthorStatsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.other = User.objects.create_user(username='other')
+
+    def assertCountsConsistent(self):
+        for user in (self.author, self.other):
+            with self.subTest(user=user):
+                user = User.objects.get(pk=user.pk)
+                self.assertEqual(get_posts_count(user),
+                                 user.posts.count())
+
+    def test_counter_follows_create_delete_and_reassign(self):
+        """Счётчик постов совпадает с реальным количеством."""
+        posts = [
+            Post.objects.create(text=f'Пост {i}', author=self.author)
+            for i in range(3)
+        ]
+        self.assertCountsConsistent()
+        posts[0].delete()
+        self.assertCountsConsistent()
+        post = Post.objects.get(pk=posts[1].pk)
+        post.author = self.other
+        post.save()
+        self.assertCountsConsistent()
+        self.assertEqual(AuthorStats.objects.get(user=self.other)
+                         .posts_count, 1)
+
+    def test_repeated_task_keeps_count(self):
+        """Повтор задачи счётчика не меняет результат."""
+        Post.objects.create(text='Пост', author=self.author)
+        update_posts_count(self.author.pk)
+        update_posts_count(self.author.pk)
+        self.assertEqual(AuthorStats.objects.get(user=self.author)
+                         .posts_count, 1)
+
+    def test_rebuild_command_restores_counters(self):
+        """Команда rebuild_posts_counts пересчитывает счётчики."""
+        Post.objects.create(text='Пост', author=self.author)
+        Post.objects.bulk_create(
+            Post(text=f'Пост {i}', author=self.other) for i in range(2)
+        )
+        AuthorStats.objects.filter(user=self.author).update(posts_count=7)
+        call_command('rebuild_posts_counts', stdout=StringIO())
+        self.assertCountsConsistent()
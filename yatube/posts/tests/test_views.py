@@ -1,8 +1,19 @@
+from http import HTTPStatus
+from io import StringIO
+
 from django import forms
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
 
+from ..cache import FEED_GROUP, FEED_INDEX, feed_key, get_feed_version
 from ..models import Group, Post, User
+from ..objects import get_posts
+from ..paginators import FEED_ORDERING, CursorPaginator, FeedPaginator
+from ..search import rebuild_search_index
+from ..timelines import (CacheTimelineStore, RedisTimelineStore,
+                         TimelineFeed, get_store, score)
 
 
 class PostPagesTests(TestCase):
@@ -43,6 +54,7 @@ class PostPagesTests(TestCase):
         }
 
     def setUp(self):
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
 
@@ -157,6 +169,7 @@ class PaginatorViewsTest(TestCase):
             )
 
     def setUp(self):
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
 
@@ -202,3 +215,613 @@ class PaginatorViewsTest(TestCase):
                     kwargs={'username': self.user.username}) + '?page=2')
         self.assertEqual(response.context['page_obj'].end_index(),
                          self.second_page_posts)
+
+
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='cursor_user')
+        cls.group = Group.objects.create(
+            title='Курсор',
+            slug='cursor_slug',
+            description='Тестовое описание',
+        )
+        for i in range(13):
+            Post.objects.create(
+                author=cls.user,
+                text='Тестовый_пост ' + str(i),
+                group=cls.group,
+            )
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile',
+                    kwargs={'username': cls.user.username}),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_cursor_pages_walk_feed(self):
+        """Курсоры ведут вперёд и назад по ленте без пропусков."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                first = self.guest_client.get(url + '?cursor=')
+                first_page = first.context['page_obj']
+                self.assertTrue(first_page.is_cursor)
+                self.assertEqual(len(first_page), 10)
+                self.assertFalse(first_page.has_previous())
+                second = self.guest_client.get(
+                    url + '?cursor=' + first_page.next_cursor)
+                second_page = second.context['page_obj']
+                self.assertEqual(len(second_page), 3)
+                self.assertFalse(second_page.has_next())
+                back = self.guest_client.get(
+                    url + '?cursor=' + second_page.previous_cursor)
+                self.assertEqual(
+                    list(back.context['page_obj']), list(first_page))
+
+    def test_cursor_page_without_count(self):
+        """Страница по курсору загружается одним запросом без COUNT."""
+        page = CursorPaginator(Post.objects.all(), 10).get_page(None)
+        with self.assertNumQueries(1):
+            CursorPaginator(Post.objects.all(), 10).get_page(
+                page.next_cursor)
+
+    def test_broken_cursor_returns_first_page(self):
+        """Испорченный курсор отдаёт первую страницу."""
+        response = self.guest_client.get(
+            reverse('posts:index') + '?cursor=broken')
+        self.assertEqual(len(response.context['page_obj']), 10)
+
+    def test_page_number_links_switch_to_cursor(self):
+        """После последнего номера страницы «Следующая» ведёт на курсор."""
+        page_obj = FeedPaginator(Post.objects.order_by(*FEED_ORDERING), 2,
+                                 max_pages=5).get_page(5)
+        self.assertTrue(page_obj.paginator.is_capped)
+        self.assertTrue(page_obj.has_next())
+        self.assertFalse(page_obj.next_is_numbered)
+        next_page = CursorPaginator(Post.objects.all(), 2).get_page(
+            page_obj.next_cursor)
+        self.assertEqual(next_page[0].text, 'Тестовый_пост 2')
+
+    def test_page_number_is_capped(self):
+        """Страницы дальше max_pages по номеру недоступны."""
+        paginator = FeedPaginator(Post.objects.order_by(*FEED_ORDERING), 2,
+                                  max_pages=5)
+        self.assertEqual(paginator.total_pages, 7)
+        self.assertEqual(paginator.get_page(7).number, 5)
+
+    def test_page_window(self):
+        """Окно номеров: первая, последняя и соседи текущей страницы."""
+        paginator = FeedPaginator(Post.objects.order_by(*FEED_ORDERING), 1)
+        self.assertEqual(paginator.get_page(7).page_window,
+                         [1, None, 5, 6, 7, 8, 9, None, 13])
+        self.assertEqual(paginator.get_page(2).page_window,
+                         [1, 2, 3, 4, None, 13])
+
+    def test_large_feed_count_is_cached(self):
+        """Для больших лент COUNT(*) берётся из кэша."""
+        cache.clear()
+        posts = Post.objects.order_by(*FEED_ORDERING)
+        paginator = FeedPaginator(posts, 10, approximate_after=10)
+        self.assertEqual(paginator.count, 13)
+        self.assertTrue(paginator.count_is_approximate)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                FeedPaginator(posts, 10, approximate_after=10).count, 13)
+        cache.clear()
+        paginator = FeedPaginator(posts, 10, approximate_after=100)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 13)
+        self.assertFalse(paginator.count_is_approximate)
+
+
+@override_settings(TASKS_EAGER=True)
+class PostQueryBudgetTest(TestCase):
+    # Запросов на страницу, не зависит от числа постов и их авторов.
+    # Замер на пустом кэше: id группы или автора для ETag, сборка ленты
+    # в хранилище лент и один запрос постов мимо кэша объектов.
+    query_budget = {
+        'posts:index': 3,
+        'posts:group_list': 5,
+        'posts:profile': 5,
+        'posts:post_detail': 2,
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Бюджет',
+            slug='budget_slug',
+            description='Тестовое описание',
+        )
+        for i in range(12):
+            author = User.objects.create_user(
+                username=f'budget_user_{i}',
+                first_name='Имя',
+                last_name=f'Фамилия {i}',
+            )
+            group = Group.objects.create(
+                title=f'Группа {i}',
+                slug=f'budget_slug_{i}',
+                description='Тестовое описание',
+            )
+            Post.objects.create(
+                author=author,
+                text='Тестовый_пост ' + str(i),
+                group=group if i % 2 else cls.group,
+            )
+        cls.post = Post.objects.latest('pub_date')
+        cls.urls = {
+            'posts:index': reverse('posts:index'),
+            'posts:group_list': reverse(
+                'posts:group_list', kwargs={'slug': cls.group.slug}),
+            'posts:profile': reverse(
+                'posts:profile',
+                kwargs={'username': cls.post.author.username}),
+            'posts:post_detail': reverse(
+                'posts:post_detail', kwargs={'post_id': cls.post.pk}),
+        }
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_pages_fit_query_budget(self):
+        """Страницы укладываются в бюджет SQL-запросов."""
+        for name, url in self.urls.items():
+            cache.clear()
+            with self.subTest(url=url):
+                with self.assertNumQueries(self.query_budget[name]):
+                    self.guest_client.get(url)
+
+
+class FeedCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='cache_user')
+        cls.group = Group.objects.create(
+            title='Кэш',
+            slug='cache_slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая',
+            slug='other_slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Исходный текст',
+            author=cls.user,
+            group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def test_feed_fragment_is_cached(self):
+        """Лента отдаётся из кэша, пока версия ленты не изменилась."""
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        Post.objects.filter(pk=self.post.pk).update(text='Без сигналов')
+        response = self.guest_client.get(url)
+        self.assertContains(response, 'Исходный текст')
+        self.assertNotContains(response, 'Без сигналов')
+
+    def test_post_save_invalidates_its_feeds(self):
+        """Сохранение поста сбрасывает только затронутые ленты."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse('posts:profile',
+                    kwargs={'username': self.user.username}),
+        )
+        for url in urls:
+            self.guest_client.get(url)
+        other_version = get_feed_version(
+            feed_key(FEED_GROUP, self.other_group.pk))
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Новый текст'
+        post.save()
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertContains(self.guest_client.get(url),
+                                    'Новый текст')
+        self.assertEqual(
+            get_feed_version(feed_key(FEED_GROUP, self.other_group.pk)),
+            other_version)
+
+    def test_group_change_invalidates_old_group_feed(self):
+        """Перенос поста в другую группу сбрасывает старую ленту группы."""
+        url = reverse('posts:group_list', kwargs={'slug': self.group.slug})
+        self.guest_client.get(url)
+        post = Post.objects.get(pk=self.post.pk)
+        post.group = self.other_group
+        post.save()
+        self.assertNotContains(self.guest_client.get(url), 'Исходный текст')
+
+    def test_author_rename_invalidates_feeds(self):
+        """Новое имя автора сразу видно в лентах с его постами."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+        )
+        for url in urls:
+            self.guest_client.get(url)
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Переименованный'
+        user.save()
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertContains(self.guest_client.get(url),
+                                    'Переименованный')
+
+    def test_login_keeps_feed_versions(self):
+        """Вход пользователя не сбрасывает ленты."""
+        version = get_feed_version(feed_key(FEED_INDEX))
+        Client().force_login(self.user)
+        self.assertEqual(get_feed_version(feed_key(FEED_INDEX)), version)
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='etag_user')
+        cls.group = Group.objects.create(
+            title='ETag',
+            slug='etag_slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            text='Текстовый пост',
+            author=cls.user,
+            group=cls.group,
+        )
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile',
+                    kwargs={'username': cls.user.username}),
+            reverse('posts:post_detail', kwargs={'post_id': cls.post.pk}),
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_unchanged_pages_return_not_modified(self):
+        """Неизменившиеся страницы отвечают 304 по ETag."""
+        for client in (self.guest_client, self.authorized_client):
+            for url in self.urls:
+                with self.subTest(url=url):
+                    etag = client.get(url)['ETag']
+                    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+                    self.assertEqual(response.status_code,
+                                     HTTPStatus.NOT_MODIFIED)
+
+    def test_last_modified_for_anonymous_only(self):
+        """Last-Modified отдаётся только гостям."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+                self.assertEqual(response.status_code,
+                                 HTTPStatus.NOT_MODIFIED)
+                response = self.authorized_client.get(url)
+                self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_edited_post_changes_validators(self):
+        """Изменение поста меняет ETag лент и страницы поста."""
+        etags = {url: self.guest_client.get(url)['ETag']
+                 for url in self.urls}
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Новый текст'
+        post.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_renamed_group_changes_feed_etags(self):
+        """Переименование группы меняет ETag лент с её постами."""
+        urls = self.urls[:3]
+        etags = {url: self.guest_client.get(url)['ETag'] for url in urls}
+        group = Group.objects.get(pk=self.group.pk)
+        group.title = 'Новое название'
+        group.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_post_page_follows_author_and_group(self):
+        """Переименование автора или группы меняет ETag страницы поста."""
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.pk})
+        for model, pk, field in ((Group, self.group.pk, 'title'),
+                                 (User, self.user.pk, 'first_name')):
+            with self.subTest(model=model.__name__):
+                etag = self.guest_client.get(url)['ETag']
+                instance = model.objects.get(pk=pk)
+                setattr(instance, field, 'Новое имя')
+                instance.save()
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_user_specific_etag(self):
+        """ETag различается для гостя и авторизованного пользователя."""
+        url = reverse('posts:index')
+        etag = self.guest_client.get(url)['ETag']
+        response = self.authorized_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+
+@override_settings(TASKS_EAGER=True)
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='search_user')
+        cls.rain = Post.objects.create(
+            text='Сегодня шли сильные дожди',
+            author=cls.user,
+        )
+        cls.rain_twice = Post.objects.create(
+            text='Дождь, дождь и снова дождь',
+            author=cls.user,
+        )
+        cls.sun = Post.objects.create(
+            text='Солнечная погода',
+            author=cls.user,
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, query, **params):
+        response = self.guest_client.get(
+            reverse('posts:search'), {'q': query, **params})
+        return list(response.context['page_obj'])
+
+    def test_search_uses_russian_stemming(self):
+        """Поиск находит другие формы слова."""
+        self.assertEqual(set(self.search('дождями')),
+                         {self.rain, self.rain_twice})
+        self.assertEqual(self.search('погоды'), [self.sun])
+
+    def test_search_ranks_results(self):
+        """Более релевантный пост выше в выдаче."""
+        self.assertEqual(self.search('дождь')[0], self.rain_twice)
+
+    def test_search_index_follows_edits_and_deletes(self):
+        """Индекс обновляется при изменении и удалении поста."""
+        post = Post.objects.get(pk=self.sun.pk)
+        post.text = 'Ясная погода'
+        post.save()
+        self.assertEqual(self.search('ясный'), [post])
+        post.delete()
+        self.assertEqual(self.search('погода'), [])
+
+    def test_empty_query(self):
+        """Пустой запрос ничего не находит."""
+        self.assertEqual(self.search(''), [])
+
+    def test_search_pagination_keeps_query(self):
+        """Ссылки пагинации сохраняют поисковый запрос."""
+        Post.objects.bulk_create(
+            Post(text=f'Дождь {i}', author=self.user) for i in range(12)
+        )
+        call_command('rebuild_search_index', stdout=StringIO())
+        response = self.guest_client.get(
+            reverse('posts:search'), {'q': 'дождь'})
+        self.assertEqual(len(response.context['page_obj']), 10)
+        self.assertContains(response, '?q=%D0%B4%D0%BE%D0%B6%D0%B4%D1%8C'
+                                      '&amp;page=2')
+        self.assertEqual(len(self.search('дождь', page=2)), 4)
+
+    def test_rebuild_indexes_in_batches(self):
+        """Перестроение индекса пачками находит все посты."""
+        self.assertEqual(rebuild_search_index(batch_size=2), 3)
+        self.assertEqual(set(self.search('дождь')),
+                         {self.rain, self.rain_twice})
+
+
+@override_settings(TASKS_EAGER=True)
+class TimelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='timeline_user')
+        cls.group = Group.objects.create(
+            title='Ленты',
+            slug='timeline_slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другие ленты',
+            slug='timeline2_slug',
+            description='Тестовое описание',
+        )
+        for i in range(13):
+            Post.objects.create(
+                author=cls.user,
+                text='Тестовый_пост ' + str(i),
+                group=cls.group,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+
+    def page(self, url_name, page=1, **kwargs):
+        response = self.guest_client.get(
+            reverse(url_name, kwargs=kwargs), {'page': page})
+        return list(response.context['page_obj'])
+
+    def timeline_ids(self, feed, pk=None):
+        return [post_id for post_id, _ in
+                get_store().range(feed_key(feed, pk), 0, 1000)]
+
+    def test_warm_feed_is_read_by_ids(self):
+        """Собранная лента читается по id, без сортировки постов."""
+        self.page('posts:index')
+        with self.assertNumQueries(3) as queries:
+            posts = self.page('posts:index', page=2)
+        page_query = queries.captured_queries[-1]['sql']
+        self.assertIn(' IN (', page_query)
+        self.assertNotIn('ORDER BY', page_query)
+        expected = Post.objects.order_by(*FEED_ORDERING)[10:]
+        self.assertEqual(posts, list(expected))
+
+    def test_new_post_is_pushed_to_timelines(self):
+        """Новый пост попадает в начало собранных лент."""
+        self.page('posts:index')
+        self.page('posts:group_list', slug=self.group.slug)
+        post = Post.objects.create(
+            author=self.user, text='Новый пост', group=self.group)
+        self.assertEqual(self.timeline_ids(FEED_INDEX)[0], post.pk)
+        self.assertEqual(self.timeline_ids(FEED_GROUP, self.group.pk)[0],
+                         post.pk)
+        self.assertEqual(self.page('posts:index')[0], post)
+
+    def test_group_change_moves_post(self):
+        """Смена группы переносит пост между лентами групп."""
+        self.page('posts:group_list', slug=self.group.slug)
+        self.page('posts:group_list', slug=self.other_group.slug)
+        post = Post.objects.filter(group=self.group).latest('pub_date')
+        post.group = self.other_group
+        post.save()
+        self.assertNotIn(post.pk,
+                         self.timeline_ids(FEED_GROUP, self.group.pk))
+        self.assertEqual(
+            self.timeline_ids(FEED_GROUP, self.other_group.pk), [post.pk])
+
+    def test_deleted_post_leaves_timelines(self):
+        """Удалённый пост пропадает из лент."""
+        self.page('posts:index')
+        post = Post.objects.latest('pub_date')
+        post.delete()
+        self.assertNotIn(post.pk, self.timeline_ids(FEED_INDEX))
+
+    def test_stale_timeline_is_rebuilt(self):
+        """Лента с несуществующим постом собирается заново."""
+        self.page('posts:index')
+        latest = Post.objects.latest('pub_date')
+        get_store().add(feed_key(FEED_INDEX), latest.pk + 100,
+                        score(latest) + 1)
+        posts = self.page('posts:index')
+        self.assertEqual(posts,
+                         list(Post.objects.order_by(*FEED_ORDERING)[:10]))
+        self.assertNotIn(latest.pk + 100, self.timeline_ids(FEED_INDEX))
+
+    def test_lagging_timeline_is_rebuilt(self):
+        """Лента, куда ещё не дошёл новый пост, собирается заново."""
+        self.page('posts:index')
+        Post.objects.bulk_create([Post(author=self.user, text='Без ленты')])
+        self.assertEqual(self.page('posts:index')[0].text, 'Без ленты')
+
+    def test_lagging_timeline_with_cached_count(self):
+        """Отставание ленты видно и при числе постов из кэша."""
+        def first_page():
+            feed = TimelineFeed(Post.objects.order_by(*FEED_ORDERING),
+                                FEED_INDEX)
+            paginator = FeedPaginator(feed, 10, approximate_after=1)
+            return list(paginator.get_page(1))
+
+        first_page()
+        Post.objects.bulk_create([Post(author=self.user, text='Без ленты')])
+        with self.assertNumQueries(3):
+            self.assertEqual(first_page()[0].text, 'Без ленты')
+
+
+class TimelineStoreTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.store = CacheTimelineStore()
+
+    def test_tied_scores_ordered_by_id(self):
+        """Посты с одинаковым временем идут по убыванию id."""
+        self.store.build('tied', [(2, 100.0), (10, 100.0), (1, 50.0)])
+        self.store.add('tied', 3, 100.0)
+        self.assertEqual(self.store.range('tied', 0, 10),
+                         [(10, 100.0), (3, 100.0), (2, 100.0), (1, 50.0)])
+
+    def test_redis_members_sort_like_ids(self):
+        """Участники Redis при равном score сортируются как id."""
+        ids = [2, 10, 3, 100000]
+        members = sorted(map(RedisTimelineStore.member, ids), reverse=True)
+        self.assertEqual([int(member) for member in members],
+                         sorted(ids, reverse=True))
+
+
+@override_settings(TASKS_EAGER=True)
+class ObjectCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='cached_user', first_name='Имя', last_name='Фамилия')
+        cls.group = Group.objects.create(
+            title='Кэш',
+            slug='cached_slug',
+            description='Тестовое описание',
+        )
+        for i in range(3):
+            Post.objects.create(
+                author=cls.user,
+                text='Тестовый_пост ' + str(i),
+                group=cls.group,
+            )
+        cls.post_ids = list(Post.objects.values_list('pk', flat=True))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_misses_are_loaded_in_one_query(self):
+        """Промахи кэша загружаются одним запросом вместе со связями."""
+        with self.assertNumQueries(1):
+            posts = get_posts(self.post_ids)
+            self.assertEqual(
+                {post.author.username for post in posts.values()},
+                {self.user.username})
+        with self.assertNumQueries(0):
+            posts = get_posts(self.post_ids)
+            self.assertEqual(
+                {post.group.slug for post in posts.values()},
+                {self.group.slug})
+
+    def test_changes_invalidate_cache(self):
+        """Изменения поста, автора и группы сбрасывают кэш."""
+        get_posts(self.post_ids)
+        post = Post.objects.get(pk=self.post_ids[0])
+        post.text = 'Новый текст'
+        post.save()
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Другое'
+        user.save()
+        cached = get_posts(self.post_ids)[post.pk]
+        self.assertEqual(cached.text, 'Новый текст')
+        self.assertEqual(cached.author.first_name, 'Другое')
+        Group.objects.get(pk=self.group.pk).delete()
+        self.assertIsNone(get_posts(self.post_ids)[post.pk].group)
+
+    def test_post_detail_uses_cache(self):
+        """Страница поста берёт пост из кэша объектов."""
+        url = reverse('posts:post_detail',
+                      kwargs={'post_id': self.post_ids[0]})
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.context['posts'].pk, self.post_ids[0])
+        self.assertEqual(response.context['count'], 3)
@@ -0,0 +1,208 @@
+import bisect
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import SimpleLazyObject
+from django.utils.module_loading import import_string
+
+from core.routers import primary_reads
+
+from .cache import FEED_AUTHOR, FEED_GROUP, feed_key
+from .objects import get_posts
+
+# Поле поста, по которому он попадает в ленту группы или автора.
+MEMBERSHIP = {FEED_GROUP: 'group_id', FEED_AUTHOR: 'author_id'}
+
+
+def score(post):
+    return post.pub_date.timestamp()
+
+
+class CacheTimelineStore:
+    """Ленты в кэше Django: локальная замена Redis для одного процесса.
+
+    Лента хранится целиком одним значением, отсортированным от новых
+    постов к старым, поэтому изменения в пределах процесса идут под
+    блокировкой.
+    """
+
+    def __init__(self, alias='default', length=1000):
+        self.cache = caches[alias]
+        self.length = length
+        self.lock = threading.Lock()
+
+    def _key(self, key):
+        return f'posts:timeline:{key}'
+
+    def exists(self, key):
+        return self.cache.get(self._key(key)) is not None
+
+    def build(self, key, items):
+        entries = sorted(((-score, -pk) for pk, score in items))
+        self.cache.set(self._key(key), entries[:self.length], None)
+
+    def add(self, key, pk, score):
+        with self.lock:
+            entries = self.cache.get(self._key(key))
+            if entries is None:
+                return
+            entry = (-score, -pk)
+            entries = [item for item in entries if item[1] != -pk]
+            bisect.insort(entries, entry)
+            self.cache.set(self._key(key), entries[:self.length], None)
+
+    def remove(self, key, pk):
+        with self.lock:
+            entries = self.cache.get(self._key(key))
+            if entries is None:
+                return
+            entries = [item for item in entries if item[1] != -pk]
+            self.cache.set(self._key(key), entries, None)
+
+    def range(self, key, start, stop):
+        entries = self.cache.get(self._key(key)) or []
+        return [(-pk, -score) for score, pk in entries[start:stop]]
+
+    def delete(self, key):
+        self.cache.delete(self._key(key))
+
+
+class RedisTimelineStore:
+    """Ленты в сортированных множествах Redis, score — время публикации.
+
+    Посты с одинаковым временем Redis упорядочивает по участнику,
+    поэтому id дополняется нулями: zrevrange отдаёт их по убыванию id,
+    как FEED_ORDERING.
+    """
+
+    def __init__(self, url='redis://localhost:6379/0', length=1000):
+        import redis
+
+        self.redis = redis.Redis.from_url(url)
+        self.length = length
+
+    def _key(self, key):
+        return f'posts:timeline:{key}'
+
+    @staticmethod
+    def member(pk):
+        return f'{pk:020d}'
+
+    def exists(self, key):
+        return bool(self.redis.exists(self._key(key) + ':built'))
+
+    def build(self, key, items):
+        name = self._key(key)
+        with self.redis.pipeline() as pipe:
+            pipe.delete(name)
+            mapping = {self.member(pk): score for pk, score in items}
+            if mapping:
+                pipe.zadd(name, mapping)
+            pipe.zremrangebyrank(name, 0, -self.length - 1)
+            pipe.set(name + ':built', 1)
+            pipe.execute()
+
+    def add(self, key, pk, score):
+        if not self.exists(key):
+            return
+        name = self._key(key)
+        with self.redis.pipeline() as pipe:
+            pipe.zadd(name, {self.member(pk): score})
+            pipe.zremrangebyrank(name, 0, -self.length - 1)
+            pipe.execute()
+
+    def remove(self, key, pk):
+        self.redis.zrem(self._key(key), self.member(pk))
+
+    def range(self, key, start, stop):
+        items = self.redis.zrevrange(self._key(key), start, stop - 1,
+                                     withscores=True)
+        return [(int(pk), score) for pk, score in items]
+
+    def delete(self, key):
+        self.redis.delete(self._key(key), self._key(key) + ':built')
+
+
+@lru_cache(maxsize=None)
+def get_store():
+    store_class = import_string(settings.POSTS_TIMELINE_STORE)
+    return store_class(length=settings.POSTS_TIMELINE_LENGTH,
+                       **settings.POSTS_TIMELINE_OPTIONS)
+
+
+def push_to_timelines(keys, post):
+    store = get_store()
+    for key in set(keys):
+        store.add(key, post.pk, score(post))
+
+
+def remove_from_timelines(keys, post_id):
+    store = get_store()
+    for key in set(keys):
+        store.remove(key, post_id)
+
+
+def drop_timelines(keys):
+    store = get_store()
+    for key in set(keys):
+        store.delete(key)
+
+
+class TimelineFeed:
+    """Лента для Paginator: id постов из хранилища лент, посты из кэша.
+
+    Страница проверяется по базе: если пост пропал, сменил группу или
+    автора, лента удаляется и собирается заново при следующем запросе.
+    """
+
+    def __init__(self, queryset, feed, pk=None):
+        self.key = feed_key(feed, pk)
+        self.queryset = queryset
+        self.membership = {MEMBERSHIP[feed]: pk} if feed in MEMBERSHIP else {}
+
+    def count(self):
+        return self.queryset.count()
+
+    def __getitem__(self, page):
+        # Лениво: при попадании в кэш фрагмента лента не нужна.
+        return SimpleLazyObject(lambda: self.get_page(page))
+
+    def get_page(self, page):
+        store = get_store()
+        if page.stop > store.length:
+            return list(self.queryset[page])
+        if not store.exists(self.key) or self.is_behind(store):
+            # Лента хранится без срока: собираем её с основной БД.
+            with primary_reads():
+                rows = self.queryset.values_list('pk', 'pub_date')
+                store.build(self.key, [
+                    (pk, pub_date.timestamp())
+                    for pk, pub_date in rows[:store.length]
+                ])
+        entries = store.range(self.key, page.start, page.stop)
+        posts = get_posts([pk for pk, _ in entries])
+        result = [posts[pk] for pk, post_score in entries
+                  if pk in posts and self.belongs(posts[pk], post_score)]
+        if len(result) != page.stop - page.start:
+            store.delete(self.key)
+            return list(self.queryset[page])
+        return result
+
+    def is_behind(self, store):
+        # Посты добавляются в ленту фоновой задачей и могут не успеть:
+        # сравниваем начало ленты с самым новым постом в базе.
+        row = self.queryset.values_list('pk', 'pub_date').first()
+        if row is None:
+            return False
+        newest = store.range(self.key, 0, 1)
+        pk, pub_date = row
+        return not newest or (newest[0][1], newest[0][0]) < (
+            pub_date.timestamp(), pk)
+
+    def belongs(self, post, post_score):
+        return score(post) == post_score and all(
+            getattr(post, field) == value
+            for field, value in self.membership.items()
+        )
@@ -0,0 +1,15 @@
+from .paginators import FEED_ORDERING, CursorPaginator, FeedPaginator
+from .timelines import TimelineFeed
+
+POSTS_PER_PAGE = 10
+
+
+def paginate(request, posts, feed=None, pk=None):
+    posts = posts.order_by(*FEED_ORDERING)
+    cursor = request.GET.get('cursor')
+    if cursor is not None:
+        return CursorPaginator(posts, POSTS_PER_PAGE).get_page(cursor)
+    if feed is not None:
+        posts = TimelineFeed(posts, feed, pk)
+    paginator = FeedPaginator(posts, POSTS_PER_PAGE)
+    return paginator.get_page(request.GET.get('page'))
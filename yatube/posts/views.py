@@ -1,59 +1,93 @@
+from urllib.parse import quote
+
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.http import (Http404, HttpResponseBadRequest,
+                         StreamingHttpResponse)
 from django.shortcuts import get_object_or_404, redirect, render
 
-from .forms import PostForm
+from .cache import (FEED_AUTHOR, FEED_GROUP, FEED_INDEX,
+                    feed_cache_context)
+from .conditional import (author_feed, feed_condition, group_feed,
+                          index_feed, post_condition)
+from .counters import get_posts_count
+from .export import EXPORT_FORMATS, export_rows
+from .forms import ExportForm, PostForm
 from .models import Group, Post, User
-
-POSTS_PER_PAGE = 10
+from .objects import get_posts
+from .paginators import FeedPaginator
+from .search import search_posts
+from .utils import POSTS_PER_PAGE, paginate
 
 
+@feed_condition(index_feed)
 def index(request):
     template = 'posts/index.html'
-    posts = Post.objects.order_by('-pub_date')
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate(request, Post.objects.for_feed(), FEED_INDEX)
     context = {
         'page_obj': page_obj,
+        'feed_cache': feed_cache_context(request, FEED_INDEX),
     }
     return render(request, template, context)
 
 
+@feed_condition(group_feed)
 def group_posts(request, slug):
     template = 'posts/group_list.html'
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.order_by('-pub_date')
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = paginate(request, group.posts.for_feed(),
+                        FEED_GROUP, group.pk)
     context = {
         'group': group,
         'page_obj': page_obj,
+        'feed_cache': feed_cache_context(request, FEED_GROUP, group.pk),
     }
     return render(request, template, context)
 
 
+def search(request):
+    template = 'posts/search.html'
+    query = request.GET.get('q', '').strip()
+    paginator = FeedPaginator(search_posts(query), POSTS_PER_PAGE,
+                              cursor_pages=False)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    context = {
+        'query': query,
+        'page_obj': page_obj,
+        'page_query': f'q={quote(query)}&',
+    }
+    return render(request, template, context)
+
+
+@feed_condition(author_feed)
 def profile(request, username):
     template = 'posts/profile.html'
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.order_by('-pub_date')
-    paginator = Paginator(posts, POSTS_PER_PAGE)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    count = Post.objects.filter(author=author.id).count
+    author = get_object_or_404(
+        User.objects.select_related('stats'), username=username
+    )
+    page_obj = paginate(request, author.posts.for_feed(),
+                        FEED_AUTHOR, author.pk)
+    count = get_posts_count(author)
     context = {
         'page_obj': page_obj,
         'author': author,
-        'count': count
+        'count': count,
+        'feed_cache': feed_cache_context(request, FEED_AUTHOR, author.pk),
     }
     return render(request, template, context)
 
 
+@post_condition()
 def post_detail(request, post_id):
     template = 'posts/post_detail.html'
-    post = get_object_or_404(Post, id=post_id)
-    count = post.author.posts.count
+    post = get_posts([post_id]).get(post_id)
+    if post is None:
+        raise Http404('Пост не найден')
+    # Счётчик автора уже прочитан вместе с ETag в post_condition.
+    count = getattr(request, '_posts_detail_state', {}).get(
+        'author__stats__posts_count'
+    )
+    if count is None:
+        count = get_posts_count(post.author)
     context = {
         'posts': post,
         'count': count,
@@ -64,7 +98,7 @@ def post_detail(request, post_id):
 @login_required()
 def post_create(request):
     template = 'posts/create_post.html'
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         form = form.save(commit=False)
         form.author = request.user
@@ -79,8 +113,27 @@ def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     if post.author != request.user:
         return redirect('posts:post_detail', post_id)
-    form = PostForm(request.POST or None, instance=post)
+    form = PostForm(request.POST or None, files=request.FILES or None,
+                    instance=post)
     if form.is_valid():
         form.save()
         return redirect('posts:post_detail', post_id)
     return render(request, template, {'form': form, 'is_edit': True})
+
+
+@login_required()
+def export(request):
+    form = ExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+    filters = form.cleaned_data
+    export_format = filters.pop('format') or 'ndjson'
+    lines, content_type = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        lines(export_rows(**filters)),
+        content_type=f'{content_type}; charset=utf-8',
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="posts.{export_format}"'
+    )
+    return response
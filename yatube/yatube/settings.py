@@ -1,5 +1,7 @@
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
@@ -28,14 +30,20 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'sorl.thumbnail',
     'posts.apps.PostsConfig',
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.profiling.ProfilingMiddleware',
+    'core.middleware.query_log.QueryLogMiddleware',
+    'core.middleware.replicas.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.static.StaticFilesMiddleware',
+    'core.middleware.compression.CompressionMiddleware',
+    'core.middleware.sessions.LazySessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -46,12 +54,29 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+# Шаблоны компилируются один раз и дальше берутся из памяти,
+# см. core.loaders. При разработке выключено: правки видны сразу.
+TEMPLATES_CACHED = os.environ.get(
+    'TEMPLATES_CACHED', '0' if DEBUG else '1'
+) == '1'
+# Скомпилированные шаблоны, которые пишет warm_templates --bundle.
+TEMPLATES_BUNDLE = os.environ.get(
+    'TEMPLATES_BUNDLE', os.path.join(BASE_DIR, 'templates.bundle')
+)
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.profiling.ProfilingDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': (
+                [('core.loaders.Loader', TEMPLATE_LOADERS)]
+                if TEMPLATES_CACHED else TEMPLATE_LOADERS
+            ),
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -64,15 +89,188 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
+ASGI_APPLICATION = 'yatube.asgi.application'
+
+# Потоков для запросов под ASGI, см. core.asgi.
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 10))
 
 
+# Режим SQLite для нагруженного узла: WAL, переиспользование соединений
+# и повтор при занятой БД, см. core.db.backends.sqlite3.
+# SQLITE_TUNED=0 возвращает стандартные настройки Django.
+SQLITE_TUNED = os.environ.get('SQLITE_TUNED', '1') == '1'
+SQLITE_TUNED_OPTIONS = {
+    'timeout': 5,
+    'transaction_mode': 'IMMEDIATE',
+    'busy_retries': 5,
+    'busy_backoff': 0.01,
+    'pragmas': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 128 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': (int(os.environ.get('CONN_MAX_AGE', 60))
+                         if SQLITE_TUNED else 0),
+        'OPTIONS': SQLITE_TUNED_OPTIONS if SQLITE_TUNED else {},
     }
 }
 
+# Реплики только для чтения: пути к файлам SQLite через запятую.
+for number, name in enumerate(
+    filter(None, os.environ.get('DATABASE_REPLICAS', '').split(',')), 1
+):
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+# Страницы, которые читают с реплик, см. core.middleware.replicas.
+DATABASE_REPLICA_VIEWS = (
+    'posts:index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+)
+# Сколько секунд после записи пользователь читает с основной БД.
+DATABASE_PIN_SECONDS = 10
+DATABASE_PIN_COOKIE = 'primary_pin'
+
+# Общий для процессов кэш: адреса memcached через запятую, нужен пакет
+# python-memcached. Без них кэш у каждого процесса свой: версии лент,
+# ленты и кэш объектов сбрасываются только в процессе, который изменил
+# данные, поэтому так можно запускать только один процесс
+# (предупреждение core.W001 в manage.py check --deploy).
+CACHE_LOCATION = os.environ.get('CACHE_LOCATION', '')
+if CACHE_LOCATION:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.profiling.ProfilingMemcachedCache',
+            'LOCATION': CACHE_LOCATION.split(','),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.profiling.ProfilingLocMemCache',
+        }
+    }
+
+# Хранилище сессий, выбирается переменной SESSION_MODE:
+# cache — в кэше, в БД только вход и выход, см. core.sessions;
+# signed_cookies — подписанная кука без БД; db — стандартное Django.
+# Режиму cache нужен общий кэш (CACHE_LOCATION): с локальным кэшем
+# процесса выход удалил бы сессию только в своём процессе, а другие
+# продолжали бы пускать пользователя по своей копии.
+SESSION_ENGINES = {
+    'cache': 'core.sessions.backends.cache_login_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'db': 'django.contrib.sessions.backends.db',
+}
+SESSION_MODE = os.environ.get('SESSION_MODE',
+                              'cache' if CACHE_LOCATION else 'db')
+if SESSION_MODE == 'cache' and not CACHE_LOCATION:
+    raise ImproperlyConfigured('SESSION_MODE=cache требует общий кэш: '
+                               'задайте CACHE_LOCATION')
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+# Изменение этих ключей записывается в БД: вход, выход, смена пароля.
+SESSION_DB_KEYS = ('_auth_user_id', '_auth_user_backend', '_auth_user_hash')
+# Продлевать срок сессии не чаще раза в столько секунд, см.
+# core.middleware.sessions; None — не продлевать без изменений.
+SESSION_REFRESH_SECONDS = 60 * 60 * 24
+
+POSTS_FEED_CACHE_TIMEOUT = 60 * 15
+
+# Хранилище лент с id последних постов, см. posts.timelines.
+# Для Redis: 'posts.timelines.RedisTimelineStore' и {'url': ...}.
+POSTS_TIMELINE_STORE = 'posts.timelines.CacheTimelineStore'
+POSTS_TIMELINE_OPTIONS = {}
+POSTS_TIMELINE_LENGTH = 1000
+
+# Кэш объектов Post, Group и User по pk, см. posts.objects.
+POSTS_OBJECT_CACHE_TIMEOUT = 60 * 60
+
+# Миниатюры картинок постов: размер для шаблонов и параметры sorl.
+# Создаются фоновой задачей при сохранении поста, шаблоны берут
+# только готовые, см. posts.images.
+POSTS_THUMBNAILS = {
+    'feed': ('960x339', {'crop': 'center', 'upscale': True}),
+    'detail': ('960x960', {'upscale': False}),
+}
+THUMBNAIL_BACKEND = 'posts.images.ThumbnailBackend'
+# Сведения о миниатюрах хранятся в БД и кэшируются.
+THUMBNAIL_KVSTORE = 'sorl.thumbnail.kvstores.cached_db_kvstore.KVStore'
+
+# Фоновые задачи после фиксации транзакции, см. core.tasks.
+# Очередь в БД: 'core.tasks.DatabaseBackend' и команда run_tasks.
+TASKS_BACKEND = os.environ.get('TASKS_BACKEND',
+                               'core.tasks.ThreadPoolBackend')
+TASKS_OPTIONS = {}
+# Выполнять задачи сразу при постановке, без очереди.
+TASKS_EAGER = False
+
+# Минификация HTML и сжатие ответов, см. core.middleware.compression.
+HTML_MINIFY = True
+# Ответ до одного TCP-сегмента сжатие не ускоряет.
+COMPRESSION_MIN_LENGTH = 1400
+# Уровни в порядке предпочтения, подобраны benchmark_compression:
+# на страницах posts сжатие занимает около 0.25 мс и окупается
+# уже на канале 100 Мбит/с, br:11 стоит 15 мс и не окупается.
+COMPRESSION_LEVELS = {'br': 6, 'gzip': 6}
+
+# Доля профилируемых запросов, см. core.middleware.profiling.
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0.05))
+# Server-Timing раскрывает SQL и тайминги, его видит только персонал.
+PROFILING_SERVER_TIMING = DEBUG
+
+# Журнал медленных и повторяющихся запросов, см. core.query_log.
+QUERY_LOG_ENABLED = True
+QUERY_LOG_SLOW_MS = 100
+QUERY_LOG_DUPLICATE_THRESHOLD = 5
+# Параметры запросов к этим таблицам и любых записей не журналируются.
+QUERY_LOG_SENSITIVE_TABLES = ('auth_user', 'django_session')
+
+LOGS_DIR = os.path.join(BASE_DIR, 'logs')
+QUERY_LOG_FILE = os.path.join(LOGS_DIR, 'queries.log')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'core.query_log.JSONFormatter',
+        },
+    },
+    'handlers': {
+        'query_log': {
+            'class': 'core.query_log.QueryLogHandler',
+            'filename': QUERY_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'yatube.queries': {
+            'handlers': ['query_log'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -107,3 +305,12 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+# collectstatic добавляет хэш содержимого к именам и кладёт рядом
+# сжатые .br и .gz, отдаёт их core.middleware.static.
+STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+# Сколько секунд браузер хранит файл с хэшем в имени.
+STATIC_MAX_AGE = 60 * 60 * 24 * 365
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')